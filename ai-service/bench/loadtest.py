@@ -0,0 +1,184 @@
+# bench/loadtest.py
+# Load test ai-service secara offline: stub backend + stub Gemini, tanpa jaringan eksternal.
+#
+#   python bench/loadtest.py --concurrency 1,8,32 --requests 100
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+sys.path.insert(0, str(BENCH_DIR))
+
+ENDPOINTS = {
+    "chat": ("POST", "/chat"),
+    "food": ("GET", "/food-recommendation"),
+    "activity": ("GET", "/activity-recommendation"),
+}
+
+CHAT_MESSAGE = "Apa yang sebaiknya saya makan hari ini untuk menambah zat besi?"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark offline ai-service")
+    parser.add_argument("--endpoints", default="chat,food,activity")
+    parser.add_argument("--concurrency", default="1,8,32", help="Daftar level concurrency")
+    parser.add_argument("--requests", type=int, default=50, help="Jumlah request per endpoint per level")
+    parser.add_argument("--users", type=int, default=100, help="Jumlah pengguna berbeda (token user-<id>)")
+    parser.add_argument("--chat-message", default=CHAT_MESSAGE, help="Pertanyaan untuk /chat")
+    parser.add_argument("--cold", action="store_true", help="Matikan cache dan penggabungan request rekomendasi")
+    parser.add_argument("--backend-port", type=int, default=8765)
+    parser.add_argument("--backend-latency-ms", type=float, default=50)
+    parser.add_argument("--backend-jitter-ms", type=float, default=20)
+    parser.add_argument("--foods", type=int, default=500, help="Ukuran katalog makanan")
+    parser.add_argument("--activities", type=int, default=50, help="Ukuran katalog aktivitas")
+    parser.add_argument("--tokens-per-second", type=float, default=200)
+    parser.add_argument("--first-token-ms", type=float, default=300)
+    parser.add_argument("--json", dest="json_path", help="Simpan hasil ke file JSON")
+    return parser.parse_args()
+
+
+def configure_env(args: argparse.Namespace) -> None:
+    # Harus di-set sebelum modul src diimpor karena config.py membaca env saat import
+    os.environ["BACKEND_URL"] = f"http://127.0.0.1:{args.backend_port}"
+    os.environ["GEMINI_API_KEY"] = "bench-offline"
+    os.environ["GEMINI_CONTEXT_CACHE"] = "false"
+    os.environ["RECOMMENDATION_CACHE_BACKEND"] = "memory"
+    os.environ["CHAT_SESSION_BACKEND"] = "memory"
+    os.environ.pop("JWT_SECRET", None)
+    os.environ.pop("JWT_PUBLIC_KEY", None)
+    if args.cold:
+        os.environ["RECOMMENDATION_CACHE_TTL"] = "0"
+        os.environ["RECOMMENDATION_COALESCE_WINDOW"] = "0"
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+async def start_backend(args: argparse.Namespace):
+    import uvicorn
+    from stub_backend import create_stub_backend
+
+    backend = create_stub_backend(
+        latency_ms=args.backend_latency_ms,
+        jitter_ms=args.backend_jitter_ms,
+        food_count=args.foods,
+        activity_count=args.activities,
+    )
+    server = uvicorn.Server(
+        uvicorn.Config(backend, host="127.0.0.1", port=args.backend_port, log_level="warning")
+    )
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.01)
+    return backend, server, task
+
+
+async def run_level(
+    client, endpoint: str, concurrency: int, total: int, users: int, message: str
+) -> dict:
+    from stub_gemini import prompt_sizes
+
+    method, path = ENDPOINTS[endpoint]
+    prompt_sizes.clear()
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for index in counter:
+            headers = {"Authorization": f"Bearer user-{index % users + 1}"}
+            kwargs = {"json": {"message": message}} if method == "POST" else {}
+            started = time.perf_counter()
+            response = await client.request(method, path, headers=headers, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    sizes = [size for sizes in prompt_sizes.values() for size in sizes]
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "rps": total / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "gemini_calls": len(sizes),
+        "prompt_chars": statistics.mean(s[0] for s in sizes) if sizes else 0,
+        "prompt_tokens": statistics.mean(s[1] for s in sizes) if sizes else 0,
+    }
+
+
+def print_report(results: list[dict], backend_requests: int) -> None:
+    header = (
+        f"{'endpoint':<10}{'conc':>6}{'req':>6}{'err':>5}{'rps':>9}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'gemini':>8}{'prompt chr':>12}{'prompt tok':>12}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['endpoint']:<10}{r['concurrency']:>6}{r['requests']:>6}{r['errors']:>5}{r['rps']:>9.1f}"
+            f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['gemini_calls']:>8}"
+            f"{r['prompt_chars']:>12.0f}{r['prompt_tokens']:>12.0f}"
+        )
+    print(f"\nRequest ke stub backend: {backend_requests}")
+
+
+async def main(args: argparse.Namespace) -> list[dict]:
+    import httpx
+    from stub_gemini import stub_model_factory
+
+    backend, server, task = await start_backend(args)
+
+    import main as ai_service
+    from services.gemini_service import set_model_factory
+    from services.user_data import close_http_client
+
+    set_model_factory(stub_model_factory(args.tokens_per_second, args.first_token_ms))
+
+    results = []
+    transport = httpx.ASGITransport(app=ai_service.app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://ai-service", timeout=120
+        ) as client:
+            for endpoint in args.endpoints.split(","):
+                for concurrency in (int(c) for c in args.concurrency.split(",")):
+                    results.append(
+                        await run_level(
+                            client, endpoint, concurrency, args.requests, args.users, args.chat_message
+                        )
+                    )
+    finally:
+        await close_http_client()
+        server.should_exit = True
+        await task
+
+    print_report(results, backend.state.request_count)
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    configure_env(arguments)
+    asyncio.run(main(arguments))
@@ -0,0 +1,195 @@
+# bench/stub_backend.py
+# Stub route /api/... backend untuk benchmark tanpa jaringan eksternal.
+import asyncio
+import hashlib
+import json
+import random
+from datetime import date, timedelta
+from fastapi import FastAPI, Request, Response
+
+NUTRIENTS = [
+    "protein",
+    "folicAcid",
+    "iron",
+    "calcium",
+    "vitaminD",
+    "omega3",
+    "fiber",
+    "iodine",
+    "fat",
+    "vitaminB",
+]
+
+
+def _envelope(data) -> dict:
+    return {"success": True, "message": "OK", "data": data}
+
+
+def _food(food_id: int, rng: random.Random) -> dict:
+    return {
+        "id": food_id,
+        "foodName": f"Makanan {food_id}",
+        "description": "Deskripsi makanan untuk benchmark",
+        "priceCategory": rng.choice(["Rendah", "Menengah", "Tinggi"]),
+        "tips": "Tips penyajian",
+        **{nutrient: rng.randint(0, 60) for nutrient in NUTRIENTS},
+    }
+
+
+def _activity(activity_id: int, rng: random.Random) -> dict:
+    return {
+        "id": activity_id,
+        "activityName": f"Aktivitas {activity_id}",
+        "description": "Deskripsi aktivitas untuk benchmark",
+        "estimatedDuration": rng.choice([10, 15, 20, 30]),
+        "caloriesPerHour": rng.randint(100, 300),
+        "level": rng.choice(["Ringan", "Sedang", "Berat"]),
+        "videoUrl": None,
+        "thumbnailUrl": None,
+        "tips": "Tips aktivitas",
+    }
+
+
+def create_stub_backend(
+    latency_ms: float = 50,
+    jitter_ms: float = 20,
+    food_count: int = 500,
+    activity_count: int = 50,
+    history_days: int = 120,
+) -> FastAPI:
+    """
+    Buat aplikasi stub backend PantauSiKecil.
+
+    Setiap route menunggu `latency_ms` ± `jitter_ms` sebelum merespons.
+    Token bearer berbentuk `user-<id>` dipetakan ke user_id tersebut.
+    Katalog makanan/aktivitas mendukung ETag dan respons 304.
+    """
+    rng = random.Random(42)
+    foods = [_food(i, rng) for i in range(1, food_count + 1)]
+    activities = [_activity(i, rng) for i in range(1, activity_count + 1)]
+    catalogs = {}
+    for name, data in (("food", foods), ("activity", activities)):
+        body = json.dumps(_envelope(data)).encode()
+        catalogs[name] = (body, f'W/"{hashlib.sha256(body).hexdigest()[:16]}"')
+
+    app = FastAPI()
+    app.state.request_count = 0
+
+    @app.middleware("http")
+    async def simulate_latency(request: Request, call_next):
+        app.state.request_count += 1
+        delay = max(latency_ms + random.uniform(-jitter_ms, jitter_ms), 0) / 1000
+        await asyncio.sleep(delay)
+        return await call_next(request)
+
+    def user_id_from(request: Request) -> int:
+        token = request.headers.get("authorization", "").removeprefix("Bearer ")
+        try:
+            return int(token.removeprefix("user-"))
+        except ValueError:
+            return 1
+
+    def catalog_response(request: Request, name: str) -> Response:
+        body, etag = catalogs[name]
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(body, media_type="application/json", headers={"ETag": etag})
+
+    @app.get("/api/auth/me")
+    async def me(request: Request):
+        user_id = user_id_from(request)
+        return _envelope(
+            {"user": {"id": user_id, "email": f"user{user_id}@example.com", "fullName": f"User {user_id}"}}
+        )
+
+    @app.get("/api/users/{user_id}/profile")
+    async def profile(user_id: int):
+        return _envelope(
+            {
+                "id": user_id,
+                "email": f"user{user_id}@example.com",
+                "fullName": f"User {user_id}",
+                "profileImage": None,
+                "age": 28,
+                "isVegetarian": False,
+                "financialStatus": "Menengah",
+                "allergy": "udang",
+                "medicalCondition": None,
+            }
+        )
+
+    @app.get("/api/users/{user_id}/nutrition/meals")
+    async def meals(user_id: int, date: str):
+        return _envelope(
+            [
+                {
+                    "id": i,
+                    "mealCategory": "Sarapan",
+                    "consumptionDate": date,
+                    "food": foods[(user_id + i) % len(foods)],
+                }
+                for i in range(2)
+            ]
+        )
+
+    @app.get("/api/users/{user_id}/nutrition/summary")
+    async def summary(user_id: int, date: str):
+        user_rng = random.Random(user_id)
+        totals = {f"total{n[0].upper()}{n[1:]}": user_rng.randint(0, 40) for n in NUTRIENTS}
+        return _envelope({"date": date, **totals, "totalWaterMl": 800})
+
+    @app.get("/api/users/{user_id}/nutrition/needs")
+    async def needs(user_id: int):
+        return _envelope(
+            {
+                "trimesterNumber": 2,
+                "waterNeedsMl": 2300,
+                **{f"{nutrient}Needs": 100 for nutrient in NUTRIENTS},
+            }
+        )
+
+    @app.get("/api/users/{user_id}/activities/today")
+    async def activity_today(user_id: int):
+        return _envelope(
+            {"date": date.today().isoformat(), "totalDurationMinutes": 20, "totalCalories": 60, "activities": []}
+        )
+
+    @app.get("/api/users/{user_id}/activities/history")
+    async def activity_history(user_id: int, startDate: str, endDate: str):
+        start = max(date.fromisoformat(startDate), date.today() - timedelta(days=history_days))
+        end = min(date.fromisoformat(endDate), date.today())
+        rows = []
+        day = start
+        while day <= end:
+            if day.toordinal() % 2 == 0:
+                activity = activities[day.toordinal() % len(activities)]
+                rows.append(
+                    {
+                        "date": day.isoformat(),
+                        "totalDurationMinutes": 30,
+                        "totalCalories": 90,
+                        "activities": [
+                            {
+                                "id": day.toordinal(),
+                                "activityName": activity["activityName"],
+                                "durationMinutes": 30,
+                                "totalCalories": 90,
+                            }
+                        ],
+                    }
+                )
+            day += timedelta(days=1)
+        return _envelope(rows)
+
+    @app.get("/api/nutrition/food")
+    async def food_catalog(request: Request):
+        return catalog_response(request, "food")
+
+    @app.get("/api/activities")
+    async def activity_catalog(request: Request):
+        return catalog_response(request, "activity")
+
+    return app
+
+
+app = create_stub_backend()
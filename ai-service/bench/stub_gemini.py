@@ -0,0 +1,139 @@
+# bench/stub_gemini.py
+# Stub GenerativeModel untuk benchmark tanpa memanggil Gemini API.
+import asyncio
+import json
+from collections import defaultdict
+from types import SimpleNamespace
+
+FOOD_RESPONSE = {
+    "recommendations": {
+        meal: {
+            "menu": [{"id": index, "nama": f"Makanan {index}"} for index in range(start, start + 3)],
+            "alasan": "Menutupi kekurangan zat besi dan asam folat hari ini.",
+        }
+        for meal, start in (("breakfast", 1), ("lunch", 4), ("dinner", 7))
+    },
+    "summary": {
+        "nutrisi_kurang": ["zat_besi", "asam_folat"],
+        "nutrisi_terpenuhi": ["protein"],
+        "catatan": "Perbanyak sayuran hijau.",
+    },
+}
+
+ACTIVITY_RESPONSE = {
+    "today_recommendation": {
+        "date": "2025-01-01",
+        "day_of_week": "Rabu",
+        "recommended_activities": [
+            {
+                "time_slot": "Pagi",
+                "activity": {"name": "Jalan santai", "duration": "20 menit", "intensity": "Ringan"},
+                "why_today": "Belum ada aktivitas hari ini.",
+            }
+        ],
+    },
+    "recommendations": {
+        slot: {"activities": [{"name": "Peregangan", "duration": "10 menit"}], "best_time": "07:00"}
+        for slot in ("morning_activities", "afternoon_activities", "evening_activities")
+    },
+    "weekly_schedule": {"senin": ["Jalan santai"], "rabu": ["Yoga prenatal"]},
+}
+
+CHAT_RESPONSE = (
+    "Halo Bunda! Berdasarkan data hari ini, asupan zat besi masih kurang. "
+    "Coba tambahkan bayam atau hati ayam pada makan siang, dan jangan lupa minum air yang cukup. "
+) * 3
+
+RESPONSES = {
+    "chat": CHAT_RESPONSE,
+    "food": json.dumps(FOOD_RESPONSE, ensure_ascii=False),
+    "activity": json.dumps(ACTIVITY_RESPONSE, ensure_ascii=False),
+}
+
+# Ukuran prompt (karakter, perkiraan token) per jenis prompt selama benchmark
+prompt_sizes: dict[str, list[tuple[int, int]]] = defaultdict(list)
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def _usage(prompt_tokens: int, response_tokens: int):
+    return SimpleNamespace(
+        prompt_token_count=prompt_tokens,
+        candidates_token_count=response_tokens,
+        total_token_count=prompt_tokens + response_tokens,
+    )
+
+
+def _chunk(text: str):
+    return SimpleNamespace(text=text, parts=[SimpleNamespace(text=text)])
+
+
+class StubStreamResponse:
+    def __init__(self, chunks: list[str], delay: float, usage_metadata):
+        self._chunks = chunks
+        self._delay = delay
+        self.usage_metadata = usage_metadata
+
+    async def __aiter__(self):
+        for text in self._chunks:
+            await asyncio.sleep(self._delay)
+            yield _chunk(text)
+
+
+class StubGenerativeModel:
+    """
+    Pengganti `genai.GenerativeModel` dengan latensi yang bisa diatur.
+
+    Latensi = `first_token_ms` + jumlah token respons / `tokens_per_second`.
+    Respons berupa JSON valid sesuai schema rekomendasi atau teks chat statis.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        system_instruction: str,
+        tokens_per_second: float = 200,
+        first_token_ms: float = 300,
+        chunk_tokens: int = 16,
+    ):
+        self.name = name
+        self.system_instruction = system_instruction
+        self.tokens_per_second = tokens_per_second
+        self.first_token_ms = first_token_ms
+        self.chunk_tokens = chunk_tokens
+        self.text = RESPONSES[name]
+
+    async def generate_content_async(self, contents, generation_config=None, stream=False):
+        prompt_tokens = estimate_tokens(self.system_instruction) + estimate_tokens(contents)
+        response_tokens = estimate_tokens(self.text)
+        prompt_sizes[self.name].append((len(contents), prompt_tokens))
+        usage = _usage(prompt_tokens, response_tokens)
+        await asyncio.sleep(self.first_token_ms / 1000)
+
+        if stream:
+            step = self.chunk_tokens * 4
+            chunks = [self.text[i : i + step] for i in range(0, len(self.text), step)]
+            return StubStreamResponse(chunks, self.chunk_tokens / self.tokens_per_second, usage)
+
+        await asyncio.sleep(response_tokens / self.tokens_per_second)
+        return SimpleNamespace(text=self.text, usage_metadata=usage)
+
+    async def count_tokens_async(self, contents):
+        return SimpleNamespace(total_tokens=estimate_tokens(contents))
+
+
+def stub_model_factory(tokens_per_second: float = 200, first_token_ms: float = 300):
+    """Buat factory untuk `gemini_service.set_model_factory`."""
+
+    def factory(name: str, system_instruction: str):
+        model = StubGenerativeModel(
+            name,
+            system_instruction,
+            tokens_per_second=tokens_per_second,
+            first_token_ms=first_token_ms,
+        )
+        return model, None
+
+    return factory
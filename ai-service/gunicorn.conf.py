@@ -0,0 +1,38 @@
+# gunicorn.conf.py
+# Profil produksi: beberapa worker uvicorn dengan state bersama di SQLite lokal.
+#
+#   pip install gunicorn uvicorn-worker
+#   gunicorn -c gunicorn.conf.py
+import multiprocessing
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+
+BASE_DIR = Path(__file__).resolve().parent
+
+# Dimuat lebih dulu agar nilai di .env tidak tertimpa default produksi di bawah
+load_dotenv(BASE_DIR / ".env")
+
+# State yang harus terlihat oleh semua worker: sesi chat (request lanjutan bisa masuk
+# ke worker lain), cache rekomendasi (termasuk hasil precompute), dan kuota Gemini
+for name in ("CHAT_SESSION_BACKEND", "RECOMMENDATION_CACHE_BACKEND", "GEMINI_RATE_BACKEND"):
+    os.environ.setdefault(name, "sqlite")
+os.environ.setdefault("SQLITE_PATH", str(BASE_DIR / "ai_service.sqlite3"))
+
+chdir = str(BASE_DIR / "src")
+wsgi_app = "main:create_app()"
+bind = os.getenv("BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+
+# Service ini async dan sebagian besar menunggu I/O; satu worker per core sudah cukup
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# Setiap worker membuat client Gemini/httpx dan memanaskan koneksinya sendiri lewat
+# lifespan sebelum menerima request; client gRPC tidak aman dibagi lewat fork
+preload_app = False
+
+# Worker yang tidak memberi heartbeat selama ini (event loop macet) dimulai ulang
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+# Waktu bagi request yang sedang berjalan (termasuk streaming chat) untuk selesai saat deploy
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
@@ -7,8 +7,140 @@ load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 BACKEND_URL = os.getenv("BACKEND_URL")
 
-if not GEMINI_API_KEY:
-    raise ValueError("GEMINI_API_KEY not found in environment")
+# Batas waktu (detik) dan ukuran pool koneksi untuk request ke backend
+BACKEND_TIMEOUT = float(os.getenv("BACKEND_TIMEOUT", "10"))
+BACKEND_MAX_CONNECTIONS = int(os.getenv("BACKEND_MAX_CONNECTIONS", "100"))
 
-if not BACKEND_URL:
-    raise ValueError("BACKEND_URL not found in environment")
+# Retry dan circuit breaker untuk request ke backend: percobaan ulang untuk error
+# sementara (timeout, 429, 5xx), jumlah kegagalan beruntun sebelum breaker terbuka,
+# dan lama (detik) breaker terbuka
+BACKEND_RETRIES = int(os.getenv("BACKEND_RETRIES", "2"))
+BACKEND_BREAKER_THRESHOLD = int(os.getenv("BACKEND_BREAKER_THRESHOLD", "5"))
+BACKEND_BREAKER_RESET = float(os.getenv("BACKEND_BREAKER_RESET", "30"))
+
+# Jumlah koneksi ke backend yang dibuka saat startup worker sebelum menerima request
+BACKEND_WARM_CONNECTIONS = int(os.getenv("BACKEND_WARM_CONNECTIONS", "4"))
+
+# Lama (detik) katalog makanan/aktivitas dianggap segar sebelum divalidasi ulang
+CATALOG_TTL = float(os.getenv("CATALOG_TTL", "600"))
+
+# Cache identitas (/api/auth/me) per token; dibatasi juga oleh `exp` JWT
+IDENTITY_CACHE_TTL = float(os.getenv("IDENTITY_CACHE_TTL", "300"))
+IDENTITY_CACHE_MAX = int(os.getenv("IDENTITY_CACHE_MAX", "10000"))
+
+# Verifikasi JWT lokal (opsional): secret HS256 yang sama dengan backend,
+# atau public key PEM untuk RS256
+JWT_SECRET = os.getenv("JWT_SECRET")
+JWT_PUBLIC_KEY = os.getenv("JWT_PUBLIC_KEY")
+
+# Riwayat aktivitas: jangkauan sinkronisasi awal (hari) dan jumlah pengguna yang disimpan
+ACTIVITY_HISTORY_LOOKBACK_DAYS = int(os.getenv("ACTIVITY_HISTORY_LOOKBACK_DAYS", "280"))
+ACTIVITY_HISTORY_MAX_USERS = int(os.getenv("ACTIVITY_HISTORY_MAX_USERS", "10000"))
+
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "models/gemini-2.0-flash")
+
+# Prefix prompt statis disimpan sebagai Gemini cached content. Nonaktif secara default:
+# butuh nama model berversi dan prompt di atas batas minimum token cached content,
+# yang belum dipenuhi prompt sistem saat ini
+GEMINI_CONTEXT_CACHE = os.getenv("GEMINI_CONTEXT_CACHE", "false").lower() == "true"
+GEMINI_CONTEXT_CACHE_TTL = int(os.getenv("GEMINI_CONTEXT_CACHE_TTL", "3600"))
+
+# Jumlah maksimum panggilan Gemini yang berjalan bersamaan per worker
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "16"))
+
+# Batas waktu (detik) per panggilan Gemini, retry untuk error sementara, dan circuit breaker
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "60"))
+GEMINI_RETRIES = int(os.getenv("GEMINI_RETRIES", "2"))
+GEMINI_BREAKER_THRESHOLD = int(os.getenv("GEMINI_BREAKER_THRESHOLD", "5"))
+GEMINI_BREAKER_RESET = float(os.getenv("GEMINI_BREAKER_RESET", "30"))
+
+# Token bucket sesuai kuota model (request per menit, 0 = tanpa batas); request yang
+# harus menunggu lebih dari GEMINI_RATE_MAX_WAIT detik langsung ditolak. Backend
+# "memory" membatasi per worker, "sqlite" membagi kuota yang sama ke seluruh worker
+GEMINI_RATE_BACKEND = os.getenv("GEMINI_RATE_BACKEND", "memory")
+GEMINI_RATE_PER_MINUTE = float(os.getenv("GEMINI_RATE_PER_MINUTE", "0"))
+GEMINI_RATE_BURST = int(os.getenv("GEMINI_RATE_BURST", "10"))
+GEMINI_RATE_MAX_WAIT = float(os.getenv("GEMINI_RATE_MAX_WAIT", "10"))
+
+# Jumlah kandidat makanan per waktu makan yang dimasukkan ke prompt rekomendasi
+FOOD_CANDIDATES_PER_MEAL = int(os.getenv("FOOD_CANDIDATES_PER_MEAL", "8"))
+
+# Sertakan usulan menu hasil hitungan lokal (lihat RECOMMENDATION_LOCAL_FALLBACK) di prompt
+# rekomendasi makanan sebagai titik awal bagi model
+FOOD_PROMPT_SEED = os.getenv("FOOD_PROMPT_SEED", "false").lower() == "true"
+
+# Jumlah maksimum generate rekomendasi jika respons model tetap tidak valid setelah diperbaiki
+RECOMMENDATION_MAX_ATTEMPTS = int(os.getenv("RECOMMENDATION_MAX_ATTEMPTS", "2"))
+
+# Jendela (detik) setelah rekomendasi selesai di mana request duplikat memakai hasil yang sama
+RECOMMENDATION_COALESCE_WINDOW = float(os.getenv("RECOMMENDATION_COALESCE_WINDOW", "2"))
+
+# Cache hasil rekomendasi: backend "memory", "sqlite", atau "redis"
+RECOMMENDATION_CACHE_BACKEND = os.getenv("RECOMMENDATION_CACHE_BACKEND", "memory")
+RECOMMENDATION_CACHE_TTL = float(os.getenv("RECOMMENDATION_CACHE_TTL", "21600"))
+RECOMMENDATION_CACHE_MAX_ENTRIES = int(os.getenv("RECOMMENDATION_CACHE_MAX_ENTRIES", "1024"))
+
+# Lama (detik) rekomendasi terakhir tiap pengguna disimpan sebagai cadangan
+# ketika Gemini gagal atau circuit breaker terbuka
+RECOMMENDATION_STALE_TTL = float(os.getenv("RECOMMENDATION_STALE_TTL", "172800"))
+
+# Rekomendasi makanan yang dihitung lokal (greedy atas database-food) dipakai ketika
+# Gemini gagal dan belum ada rekomendasi terakhir pengguna
+RECOMMENDATION_LOCAL_FALLBACK = os.getenv("RECOMMENDATION_LOCAL_FALLBACK", "true").lower() == "true"
+
+# Precompute rekomendasi harian (src/precompute.py): jumlah pengguna yang diproses
+# bersamaan, batas pengguna baru per menit, percobaan ulang saat terkena rate limit,
+# dan file progres agar job yang terhenti bisa dilanjutkan
+PRECOMPUTE_CONCURRENCY = int(os.getenv("PRECOMPUTE_CONCURRENCY", "4"))
+PRECOMPUTE_RATE_PER_MINUTE = float(os.getenv("PRECOMPUTE_RATE_PER_MINUTE", "60"))
+PRECOMPUTE_MAX_RETRIES = int(os.getenv("PRECOMPUTE_MAX_RETRIES", "3"))
+# Umur (detik) token layanan yang dibuat per pengguna saat precompute (butuh JWT_SECRET)
+PRECOMPUTE_TOKEN_TTL = float(os.getenv("PRECOMPUTE_TOKEN_TTL", "600"))
+PRECOMPUTE_PROGRESS_PATH = os.getenv("PRECOMPUTE_PROGRESS_PATH", "precompute_progress.json")
+
+# Sesi chat MediBot: backend penyimpanan, umur sesi, umur salinan konteks pengguna,
+# dan anggaran token riwayat sebelum giliran lama dipadatkan ke ringkasan
+CHAT_SESSION_BACKEND = os.getenv("CHAT_SESSION_BACKEND", "memory")
+CHAT_SESSION_TTL = float(os.getenv("CHAT_SESSION_TTL", "21600"))
+CHAT_SESSION_MAX = int(os.getenv("CHAT_SESSION_MAX", "10000"))
+CHAT_CONTEXT_TTL = float(os.getenv("CHAT_CONTEXT_TTL", "300"))
+CHAT_HISTORY_TOKEN_BUDGET = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "1500"))
+CHAT_SUMMARY_MAX_CHARS = int(os.getenv("CHAT_SUMMARY_MAX_CHARS", "2000"))
+
+# Muat hanya bagian data pengguna (profil/nutrisi/aktivitas) yang dibutuhkan pertanyaan chat
+CHAT_LAZY_CONTEXT = os.getenv("CHAT_LAZY_CONTEXT", "true").lower() == "true"
+
+# Cache jawaban MediBot untuk pertanyaan umum yang tidak bergantung pada pengguna:
+# umur entri, jumlah maksimum, proporsi minimal kata yang sama persis untuk pertanyaan yang
+# hanya berbeda salah ketik (>= 1 = hanya pencocokan persis),
+# dan file snapshot yang dimuat saat startup dan ditulis tiap ANSWER_CACHE_SNAPSHOT_INTERVAL
+# detik serta saat shutdown (kosong = tanpa snapshot, interval <= 0 = hanya saat shutdown)
+ANSWER_CACHE = os.getenv("ANSWER_CACHE", "true").lower() == "true"
+ANSWER_CACHE_TTL = float(os.getenv("ANSWER_CACHE_TTL", "604800"))
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "2000"))
+ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "1"))
+ANSWER_CACHE_SNAPSHOT = os.getenv("ANSWER_CACHE_SNAPSHOT", "answer_cache.json")
+ANSWER_CACHE_SNAPSHOT_INTERVAL = float(os.getenv("ANSWER_CACHE_SNAPSHOT_INTERVAL", "300"))
+
+# Kompresi respons (gzip, atau brotli jika paket `brotli` terpasang) untuk body
+# berukuran minimal COMPRESSION_MIN_SIZE byte; streaming SSE tidak dikompresi
+COMPRESSION = os.getenv("COMPRESSION", "true").lower() == "true"
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+
+# Kirim header Server-Timing berisi durasi tiap tahap (backend, gemini, parse)
+SERVER_TIMING = os.getenv("SERVER_TIMING", "false").lower() == "true"
+
+# Lokasi penyimpanan bersama untuk backend "sqlite" dan "redis"
+SQLITE_PATH = os.getenv("SQLITE_PATH", "ai_service.sqlite3")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+def validate_config() -> None:
+    """Pastikan variabel wajib tersedia; dipanggil saat aplikasi atau CLI mulai, bukan saat import."""
+    if not GEMINI_API_KEY:
+        raise ValueError("GEMINI_API_KEY not found in environment")
+
+    if not BACKEND_URL:
+        raise ValueError("BACKEND_URL not found in environment")
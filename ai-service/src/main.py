@@ -1,135 +1,175 @@
 # src/main.py
-import json
-from typing import Any, Dict
-from fastapi import FastAPI, Depends, HTTPException
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from models.request import ChatRequest
-from utils.auth import get_bearer_token
-from services.user_data import (
-    fetch_user_data,
-    fetch_user_food_rec_context,
-    fetch_user_actv_rec_context,
+from config import (
+    SERVER_TIMING,
+    COMPRESSION,
+    COMPRESSION_MIN_SIZE,
+    COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_BROTLI_QUALITY,
+    ANSWER_CACHE_SNAPSHOT_INTERVAL,
+    validate_config,
 )
+from routes.chat import chat_router
+from routes.metrics import metrics_router
+from routes.recommendation import recommendation_router
+from services.user_data import warm_http_client, close_http_client, backend_resilience
 from services.gemini_service import (
-    generate_response,
-    food_recommendation,
-    activity_recommendation,
+    configure_gemini,
+    warm_prompt_caches,
+    warm_gemini_connection,
+    generation_stats,
+    gemini_resilience,
 )
-
-app = FastAPI()
-
-# Middleware CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Ganti dengan domain frontend jika sudah tahu
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+from services.recommendation_cache import recommendation_cache
+from services.answer_cache import answer_cache
+from services.recommender import recommendation_flight
+from services.identity import identity_cache
+from utils.compression import CompressionMiddleware
+from utils.metrics import (
+    registry,
+    CallbackMetric,
+    request_duration,
+    start_request_timings,
+    server_timing_header,
 )
 
-
-@app.post("/chat")
-async def chat_endpoint(req: ChatRequest, token: str = Depends(get_bearer_token)):
-    try:
-        user_context = fetch_user_data(token)
-        reply = generate_response(req.message, user_context)
-        return {
-            "success": True,
-            "user_id": user_context.get("user_id"),
-            "reply": reply,
-        }
-    except HTTPException as e:
-        raise e
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+registry.register(
+    CallbackMetric("ai_gemini_generation", "Slot dan antrean panggilan Gemini", generation_stats)
+)
+registry.register(
+    CallbackMetric(
+        "ai_recommendation_cache_total",
+        "Hit/miss cache hasil rekomendasi",
+        recommendation_cache.stats,
+        type="counter",
+    )
+)
+registry.register(
+    CallbackMetric(
+        "ai_recommendation_coalesce",
+        "Request rekomendasi yang dieksekusi vs digabung",
+        recommendation_flight.stats,
+    )
+)
+registry.register(
+    CallbackMetric(
+        "ai_answer_cache_total",
+        "Hit (persis/mirip) dan miss cache jawaban chat umum",
+        answer_cache.stats,
+        type="counter",
+    )
+)
+registry.register(
+    CallbackMetric(
+        "ai_identity_cache_total",
+        "Resolusi identitas dari cache, backend, atau JWT lokal",
+        identity_cache.stats,
+        type="counter",
+    )
+)
+registry.register(
+    CallbackMetric(
+        "ai_backend_calls_total",
+        "Panggilan ke backend: total, dicoba ulang, dan ditolak breaker",
+        backend_resilience.stats,
+        type="counter",
+        label="type",
+    )
+)
+registry.register(
+    CallbackMetric(
+        "ai_gemini_calls_total",
+        "Panggilan ke Gemini: total, dicoba ulang, dan ditolak breaker/rate limit",
+        gemini_resilience.stats,
+        type="counter",
+        label="type",
+    )
+)
+registry.register(
+    CallbackMetric(
+        "ai_circuit_breaker_open",
+        "Status circuit breaker (1 = terbuka/half-open)",
+        lambda: {
+            resilient.name: int(resilient.breaker.state != "closed")
+            for resilient in (backend_resilience, gemini_resilience)
+        },
+        label="service",
+    )
+)
 
 
-@app.get("/food-recommendation")
-async def food_recommendation_endpoint(token: str = Depends(get_bearer_token)):
+@asynccontextmanager
+async def lifespan(app: FastAPI):
     """
-    Endpoint untuk mendapatkan rekomendasi makanan untuk ibu hamil
-    berdasarkan profil nutrisi dan makanan yang telah dikonsumsi.
+    Inisialisasi per worker sebelum worker menerima request: validasi config,
+    client Gemini, model/cached content, koneksi backend, dan snapshot cache
+    jawaban. Snapshot ditulis berkala selama worker berjalan dan sekali lagi
+    saat shutdown, lalu koneksi ditutup.
     """
-    try:
-        # Ambil context pengguna
-        context = fetch_user_food_rec_context(token)
-
-        # Generate rekomendasi makanan
-        recommendation_response = food_recommendation(context)
-
-        # Parse dan bersihkan response dari model
-        cleaned_data = clean_model_response(recommendation_response)
-
-        return {"success": True, "data": cleaned_data}
-
-    except HTTPException as e:
-        raise e
-    except json.JSONDecodeError as e:
-        raise HTTPException(
-            status_code=500, detail=f"Invalid JSON response from model: {str(e)}"
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
-
-
-@app.get("/activity-recommendation")
-async def activity_recommendation_endpoint(token: str = Depends(get_bearer_token)):
+    validate_config()
+    configure_gemini()
+    answer_cache.load()
+    await asyncio.gather(warm_prompt_caches(), warm_http_client())
+    await warm_gemini_connection()
+    snapshots = asyncio.create_task(answer_cache.save_periodically(ANSWER_CACHE_SNAPSHOT_INTERVAL))
+    yield
+    snapshots.cancel()
+    answer_cache.save()
+    await close_http_client()
+
+
+async def timing_middleware(request: Request, call_next):
+    """Catat durasi request per endpoint dan (opsional) kirim header Server-Timing."""
+    started = time.perf_counter()
+    timings = start_request_timings()
+    response = await call_next(request)
+
+    elapsed = time.perf_counter() - started
+    route = request.scope.get("route")
+    request_duration.observe(
+        elapsed,
+        method=request.method,
+        path=getattr(route, "path", "unmatched"),
+        status=response.status_code,
+    )
+    if SERVER_TIMING:
+        timings["total"] = elapsed
+        response.headers["Server-Timing"] = server_timing_header(timings)
+    return response
+
+
+def create_app() -> FastAPI:
     """
-    Endpoint untuk mendapatkan rekomendasi aktivitas fisik untuk ibu hamil
-    berdasarkan profil kesehatan, trimester, dan kondisi saat ini.
+    Buat aplikasi FastAPI. Dipakai langsung oleh `uvicorn --factory main:create_app`
+    atau lewat `app` di bawah; setiap worker gunicorn memanggilnya sekali.
     """
-    try:
-        # Ambil context pengguna untuk aktivitas
-        context = fetch_user_actv_rec_context(token)
-
-        # Generate rekomendasi aktivitas
-        recommendation_response = activity_recommendation(context)
-
-        # Parse dan bersihkan response dari model
-        cleaned_data = clean_model_response(recommendation_response)
-
-        return {"success": True, "data": cleaned_data}
-
-    except HTTPException as e:
-        raise e
-    except json.JSONDecodeError as e:
-        raise HTTPException(
-            status_code=500, detail=f"Invalid JSON response from model: {str(e)}"
+    app = FastAPI(lifespan=lifespan)
+
+    # Middleware CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # Ganti dengan domain frontend jika sudah tahu
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    if COMPRESSION:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=COMPRESSION_MIN_SIZE,
+            gzip_level=COMPRESSION_GZIP_LEVEL,
+            brotli_quality=COMPRESSION_BROTLI_QUALITY,
         )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
-
-
-def clean_model_response(response: str) -> Dict[Any, Any]:
-    """
-    Membersihkan response dari model AI dan mengkonversi ke dictionary.
-
-    Args:
-        response: Raw response string dari model AI
-
-    Returns:
-        Dict: Parsed JSON response
-
-    Raises:
-        json.JSONDecodeError: Jika response bukan JSON yang valid
-    """
-    # Remove markdown code blocks if present
-    cleaned_response = response.strip()
+    app.middleware("http")(timing_middleware)
 
-    if cleaned_response.startswith("```json"):
-        cleaned_response = cleaned_response[7:]  # Remove ```json
-    if cleaned_response.startswith("```"):
-        cleaned_response = cleaned_response[3:]  # Remove ```
-    if cleaned_response.endswith("```"):
-        cleaned_response = cleaned_response[:-3]  # Remove trailing ```
+    app.include_router(chat_router)
+    app.include_router(recommendation_router)
+    app.include_router(metrics_router)
+    return app
 
-    # Remove any leading/trailing whitespace
-    cleaned_response = cleaned_response.strip()
 
-    # Parse JSON
-    try:
-        return json.loads(cleaned_response)
-    except json.JSONDecodeError as e:
-        # Log the problematic response for debugging
-        print(f"Failed to parse JSON: {cleaned_response}")
-        raise e
+app = create_app()
@@ -0,0 +1,120 @@
+# src/models/recommendation.py
+from pydantic import BaseModel, ConfigDict
+
+
+class LenientModel(BaseModel):
+    # Field tambahan dari model tetap dipertahankan agar tidak ada data yang hilang
+    model_config = ConfigDict(extra="allow")
+
+
+# Rekomendasi makanan
+
+
+class MenuItem(LenientModel):
+    id: int | str
+    nama: str
+
+
+class MealRecommendation(LenientModel):
+    menu: list[MenuItem] = []
+    alasan: str = ""
+
+
+class MealRecommendations(LenientModel):
+    breakfast: MealRecommendation
+    lunch: MealRecommendation
+    dinner: MealRecommendation
+
+
+class NutritionSummary(LenientModel):
+    nutrisi_kurang: list[str] = []
+    nutrisi_terpenuhi: list[str] = []
+    catatan: str = ""
+
+
+class FoodRecommendationResponse(LenientModel):
+    recommendations: MealRecommendations
+    summary: NutritionSummary = NutritionSummary()
+
+
+# Rekomendasi aktivitas
+
+
+class TodayActivity(LenientModel):
+    name: str
+    duration: str | int = ""
+    intensity: str = ""
+    step_by_step: list[str] = []
+    equipment_needed: list[str] = []
+    location: str = ""
+
+
+class TodayActivitySlot(LenientModel):
+    time_slot: str = ""
+    activity: TodayActivity
+    why_today: str = ""
+
+
+class DailyGoals(LenientModel):
+    movement_target: str = ""
+    hydration_reminder: str = ""
+    rest_periods: str = ""
+
+
+class TodayRecommendation(LenientModel):
+    date: str = ""
+    day_of_week: str = ""
+    recommended_activities: list[TodayActivitySlot] = []
+    daily_goals: DailyGoals = DailyGoals()
+    weather_consideration: str = ""
+    energy_level_tips: str = ""
+
+
+class ActivityItem(LenientModel):
+    name: str
+    duration: str | int = ""
+    intensity: str = ""
+    benefits: list[str] = []
+    instructions: str = ""
+
+
+class TimeSlotActivities(LenientModel):
+    activities: list[ActivityItem] = []
+    best_time: str = ""
+    precautions: list[str] = []
+
+
+class ActivityRecommendations(LenientModel):
+    morning_activities: TimeSlotActivities = TimeSlotActivities()
+    afternoon_activities: TimeSlotActivities = TimeSlotActivities()
+    evening_activities: TimeSlotActivities = TimeSlotActivities()
+
+
+class TrimesterSpecific(LenientModel):
+    current_trimester: str | int = ""
+    safe_activities: list[str] = []
+    avoid_activities: list[str] = []
+    modifications: str = ""
+
+
+class HealthConsiderations(LenientModel):
+    safe_for_user: bool = True
+    special_conditions: list[str] = []
+    warning_signs: list[str] = []
+    when_to_stop: list[str] = []
+
+
+class ActivitySummary(LenientModel):
+    total_weekly_duration: str | int = ""
+    fitness_goals: list[str] = []
+    progress_tracking: str = ""
+    notes: str = ""
+
+
+class ActivityRecommendationResponse(LenientModel):
+    today_recommendation: TodayRecommendation
+    recommendations: ActivityRecommendations
+    weekly_schedule: dict[str, list[str]] = {}
+    trimester_specific: TrimesterSpecific = TrimesterSpecific()
+    health_considerations: HealthConsiderations = HealthConsiderations()
+    summary: ActivitySummary = ActivitySummary()
@@ -4,3 +4,4 @@ from pydantic import BaseModel
 
 class ChatRequest(BaseModel):
     message: str
+    session_id: str | None = None
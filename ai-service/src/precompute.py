@@ -0,0 +1,73 @@
+# src/precompute.py
+# Precompute rekomendasi makanan & aktivitas hari ini untuk pengguna aktif.
+#
+#   RECOMMENDATION_CACHE_BACKEND=sqlite python src/precompute.py --user-ids users.txt
+import argparse
+import asyncio
+import logging
+from config import (
+    validate_config,
+    JWT_SECRET,
+    RECOMMENDATION_CACHE_BACKEND,
+    PRECOMPUTE_CONCURRENCY,
+    PRECOMPUTE_RATE_PER_MINUTE,
+    PRECOMPUTE_MAX_RETRIES,
+    PRECOMPUTE_TOKEN_TTL,
+    PRECOMPUTE_PROGRESS_PATH,
+)
+from services.gemini_service import configure_gemini
+from services.precompute import PrecomputeJob, PrecomputeProgress
+from services.recommender import RECOMMENDERS
+from services.user_data import close_http_client
+
+logger = logging.getLogger(__name__)
+
+
+def read_user_ids(path: str) -> list[int]:
+    """Satu user id per baris; baris kosong dan baris diawali `#` diabaikan."""
+    with open(path) as f:
+        lines = (line.strip() for line in f)
+        return list(dict.fromkeys(int(line) for line in lines if line and not line.startswith("#")))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Precompute rekomendasi harian")
+    parser.add_argument("--user-ids", required=True, help="File user id pengguna aktif")
+    parser.add_argument("--kinds", default=",".join(RECOMMENDERS))
+    parser.add_argument("--concurrency", type=int, default=PRECOMPUTE_CONCURRENCY)
+    parser.add_argument("--rate", type=float, default=PRECOMPUTE_RATE_PER_MINUTE, help="Pengguna per menit")
+    parser.add_argument("--max-retries", type=int, default=PRECOMPUTE_MAX_RETRIES)
+    parser.add_argument("--progress", default=PRECOMPUTE_PROGRESS_PATH)
+    return parser.parse_args()
+
+
+async def main(args: argparse.Namespace) -> None:
+    validate_config()
+    if not JWT_SECRET:
+        raise SystemExit("Precompute membutuhkan JWT_SECRET untuk membuat token layanan per pengguna")
+    configure_gemini()
+    if RECOMMENDATION_CACHE_BACKEND == "memory":
+        logger.warning(
+            "RECOMMENDATION_CACHE_BACKEND=memory: hasil precompute tidak terlihat oleh "
+            "proses service; gunakan sqlite atau redis"
+        )
+
+    user_ids = read_user_ids(args.user_ids)
+    job = PrecomputeJob(
+        PrecomputeProgress(args.progress),
+        kinds=args.kinds.split(","),
+        concurrency=args.concurrency,
+        rate_per_minute=args.rate,
+        max_retries=args.max_retries,
+        token_ttl=PRECOMPUTE_TOKEN_TTL,
+    )
+    try:
+        stats = await job.run(user_ids)
+    finally:
+        await close_http_client()
+    logger.info("Precompute selesai untuk %d pengguna: %s", len(user_ids), stats)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    asyncio.run(main(parse_args()))
@@ -1,18 +1,120 @@
 # src/routes/chat.py
+import time
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from config import ANSWER_CACHE
 from models.request import ChatRequest
 from utils.auth import get_bearer_token
-from services.user_data import fetch_user_data
-from services.gemini_service import generate_response
+from utils.sse import format_sse
+from utils.resilience import ResilienceError
+from services.answer_cache import answer_cache
+from services.chat_intent import is_generic_question
+from services.chat_session import chat_sessions
+from services.gemini_service import generate_response, generate_response_stream
 
 chat_router = APIRouter()
 
 
+async def _open_session(req: ChatRequest, token: str) -> tuple[dict, bool]:
+    """
+    Buka sesi chat. Pertanyaan umum dijawab tanpa data pribadi dan riwayat
+    percakapan agar jawabannya dapat dibagikan lewat answer_cache.
+    """
+    generic = ANSWER_CACHE and is_generic_question(req.message)
+    session = await chat_sessions.open(
+        req.session_id, token, req.message, sections=[] if generic else None
+    )
+    return session, generic
+
+
 @chat_router.post("/chat")
 async def chat(req: ChatRequest, token: str = Depends(get_bearer_token)):
     try:
-        user_context = fetch_user_data(token)
-        reply = generate_response(req.message, user_context)
-        return {"success": True, "user_id": user_context.get("user_id"), "reply": reply}
+        session, generic = await _open_session(req, token)
+        reply = answer_cache.lookup(req.message) if generic else None
+        if reply is None:
+            reply = await generate_response(
+                req.message,
+                chat_sessions.prompt_context(session),
+                "" if generic else chat_sessions.history_prompt(session),
+            )
+            if generic:
+                answer_cache.store(req.message, reply)
+        await chat_sessions.record(session, req.message, reply)
+        return {
+            "success": True,
+            "user_id": session["user_id"],
+            "session_id": session["id"],
+            "reply": reply,
+        }
+    except HTTPException as e:
+        raise e
+    except ResilienceError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Layanan AI sedang sibuk: {str(e)}",
+            headers={"Retry-After": str(int(e.retry_after) + 1)},
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@chat_router.post("/chat/stream")
+async def chat_stream(req: ChatRequest, token: str = Depends(get_bearer_token)):
+    """
+    Versi streaming dari /chat menggunakan Server-Sent Events.
+    Setiap potongan jawaban dikirim sebagai frame `data: {"text": ...}`,
+    diakhiri frame `event: done` berisi user_id, session_id, dan metadata waktu.
+    """
+    started = time.perf_counter()
+    # Kegagalan backend tetap dikembalikan sebagai status HTTP sebelum stream dimulai
+    session, generic = await _open_session(req, token)
+    cached_reply = answer_cache.lookup(req.message) if generic else None
+    context_ms = (time.perf_counter() - started) * 1000
+
+    async def reply_chunks():
+        if cached_reply is not None:
+            yield cached_reply
+            return
+        async for text in generate_response_stream(
+            req.message,
+            chat_sessions.prompt_context(session),
+            "" if generic else chat_sessions.history_prompt(session),
+        ):
+            yield text
+
+    async def event_stream():
+        first_token_ms = None
+        chunks = []
+        try:
+            async for text in reply_chunks():
+                if first_token_ms is None:
+                    first_token_ms = (time.perf_counter() - started) * 1000
+                chunks.append(text)
+                yield format_sse({"text": text})
+
+            reply = "".join(chunks)
+            if generic and cached_reply is None:
+                answer_cache.store(req.message, reply)
+            await chat_sessions.record(session, req.message, reply)
+            yield format_sse(
+                {
+                    "success": True,
+                    "user_id": session["user_id"],
+                    "session_id": session["id"],
+                    "timing": {
+                        "context_ms": round(context_ms, 1),
+                        "first_token_ms": round(first_token_ms or 0, 1),
+                        "total_ms": round((time.perf_counter() - started) * 1000, 1),
+                    },
+                },
+                event="done",
+            )
+        except Exception as e:
+            yield format_sse({"success": False, "detail": str(e)}, event="error")
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
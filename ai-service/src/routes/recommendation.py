@@ -0,0 +1,98 @@
+# src/routes/recommendation.py
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+from utils.auth import get_bearer_token
+from utils.resilience import ResilienceError
+from services.recommender import RECOMMENDERS, recommend
+
+recommendation_router = APIRouter()
+
+FIELDS_DESCRIPTION = (
+    "Bagian respons yang dikirim, dipisah koma; path bertingkat memakai titik "
+    "(misal `today_recommendation,summary.notes`). Kosong = seluruh respons. "
+    "Bagian lain dapat diambil kemudian dari hasil yang sama di cache."
+)
+
+
+def parse_fields(kind: str, fields: str | None) -> list[list[str]]:
+    """Pecah `?fields=` menjadi path; bagian teratas harus ada di schema respons."""
+    if not fields:
+        return []
+    paths = [field.strip().split(".") for field in fields.split(",") if field.strip()]
+    known = RECOMMENDERS[kind][2].model_fields
+    unknown = sorted({path[0] for path in paths if path[0] not in known})
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Field tidak dikenal: {', '.join(unknown)}. Pilihan: {', '.join(known)}",
+        )
+    return paths
+
+
+def select_fields(data: dict, paths: list[list[str]]) -> dict:
+    """Ambil hanya path yang diminta dengan struktur yang sama; path yang tidak ada dilewati."""
+    if not paths:
+        return data
+    selected: dict = {}
+    for path in paths:
+        value = data
+        for key in path:
+            if not isinstance(value, dict) or key not in value:
+                break
+            value = value[key]
+        else:
+            target = selected
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = value
+    return selected
+
+
+async def _recommendation_response(kind: str, token: str, fields: str | None) -> JSONResponse:
+    paths = parse_fields(kind, fields)
+    try:
+        cleaned_data = await recommend(kind, token)
+
+        # Data sudah berupa tipe JSON (hasil model_dump/cache) sehingga tidak perlu jsonable_encoder
+        return JSONResponse({"success": True, "data": select_fields(cleaned_data, paths)})
+
+    except HTTPException as e:
+        raise e
+    except ResilienceError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Layanan AI sedang sibuk: {str(e)}",
+            headers={"Retry-After": str(int(e.retry_after) + 1)},
+        )
+    except (json.JSONDecodeError, ValidationError) as e:
+        raise HTTPException(
+            status_code=500, detail=f"Invalid JSON response from model: {str(e)}"
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@recommendation_router.get("/food-recommendation")
+async def food_recommendation_endpoint(
+    token: str = Depends(get_bearer_token),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+):
+    """
+    Endpoint untuk mendapatkan rekomendasi makanan untuk ibu hamil
+    berdasarkan profil nutrisi dan makanan yang telah dikonsumsi.
+    """
+    return await _recommendation_response("food", token, fields)
+
+
+@recommendation_router.get("/activity-recommendation")
+async def activity_recommendation_endpoint(
+    token: str = Depends(get_bearer_token),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+):
+    """
+    Endpoint untuk mendapatkan rekomendasi aktivitas fisik untuk ibu hamil
+    berdasarkan profil kesehatan, trimester, dan kondisi saat ini.
+    """
+    return await _recommendation_response("activity", token, fields)
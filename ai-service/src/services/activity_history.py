@@ -0,0 +1,138 @@
+# src/services/activity_history.py
+import asyncio
+from collections import Counter, OrderedDict
+from datetime import date, timedelta
+from config import ACTIVITY_HISTORY_LOOKBACK_DAYS, ACTIVITY_HISTORY_MAX_USERS
+
+HISTORY_PATH = "/api/users/{user_id}/activities/history?startDate={start}&endDate={end}"
+
+SUMMARY_DAYS = 7
+SUMMARY_WEEKS = 4
+TOP_ACTIVITIES = 5
+
+
+class ActivityHistoryStore:
+    """
+    Riwayat aktivitas per pengguna yang disinkronkan secara inkremental.
+
+    Sinkronisasi pertama mengambil `lookback_days` hari terakhir; setelah itu
+    hanya hari sejak sinkronisasi terakhir (termasuk hari itu sendiri, karena
+    bisa bertambah) yang diambil dari backend. Data disimpan sebagai agregat
+    harian sehingga prompt menerima ringkasan berukuran tetap, bukan seluruh
+    baris riwayat.
+    """
+
+    def __init__(self, lookback_days: int, max_users: int):
+        self.lookback_days = lookback_days
+        self.max_users = max_users
+        self._users: OrderedDict[int, dict] = OrderedDict()
+        self._locks: dict[int, asyncio.Lock] = {}
+
+    async def summary(self, user_id: int, headers: dict, fetch_json) -> dict:
+        lock = self._locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            state = await self._sync(user_id, headers, fetch_json)
+        return self._summarize(state, date.today())
+
+    async def _sync(self, user_id: int, headers: dict, fetch_json) -> dict:
+        today = date.today()
+        state = self._users.get(user_id)
+        if state is None:
+            state = {"synced_through": None, "days": {}, "activity_counts": Counter()}
+            start = today - timedelta(days=self.lookback_days)
+        else:
+            start = state["synced_through"]
+
+        payload = await fetch_json(
+            HISTORY_PATH.format(user_id=user_id, start=start, end=today), headers
+        )
+        fetched = {
+            row["date"]: row
+            for row in (payload.get("data") or [])
+            if row.get("date")
+        }
+
+        # Hari dalam rentang yang diambil ulang diganti seluruhnya (aktivitas bisa dihapus)
+        day = start
+        while day <= today:
+            key = day.isoformat()
+            self._drop_day(state, key)
+            if key in fetched:
+                self._add_day(state, key, fetched[key])
+            day += timedelta(days=1)
+
+        if state["synced_through"] != today:
+            self._prune(state, today)
+        state["synced_through"] = today
+
+        self._users[user_id] = state
+        self._users.move_to_end(user_id)
+        while len(self._users) > self.max_users:
+            evicted, _ = self._users.popitem(last=False)
+            self._locks.pop(evicted, None)
+        return state
+
+    @staticmethod
+    def _add_day(state: dict, key: str, row: dict) -> None:
+        activities = Counter(
+            activity.get("activityName") for activity in row.get("activities") or []
+        )
+        state["days"][key] = {
+            "minutes": row.get("totalDurationMinutes") or 0,
+            "calories": row.get("totalCalories") or 0,
+            "sessions": sum(activities.values()),
+            "activities": activities,
+        }
+        state["activity_counts"].update(activities)
+
+    @staticmethod
+    def _drop_day(state: dict, key: str) -> None:
+        previous = state["days"].pop(key, None)
+        if previous is not None:
+            state["activity_counts"].subtract(previous["activities"])
+
+    def _prune(self, state: dict, today: date) -> None:
+        cutoff = (today - timedelta(days=self.lookback_days)).isoformat()
+        for key in [key for key in state["days"] if key < cutoff]:
+            self._drop_day(state, key)
+        state["activity_counts"] = +state["activity_counts"]
+
+    @staticmethod
+    def _summarize(state: dict, today: date) -> dict:
+        days = state["days"]
+
+        daily_minutes = {}
+        for offset in range(SUMMARY_DAYS - 1, -1, -1):
+            key = (today - timedelta(days=offset)).isoformat()
+            daily_minutes[key] = days.get(key, {}).get("minutes", 0)
+
+        weekly_totals = []
+        for week in range(SUMMARY_WEEKS):
+            week_end = today - timedelta(days=7 * week)
+            week_start = week_end - timedelta(days=6)
+            totals = {"minutes": 0, "calories": 0, "sessions": 0}
+            for offset in range(7):
+                entry = days.get((week_start + timedelta(days=offset)).isoformat())
+                if entry:
+                    for field in totals:
+                        totals[field] += entry[field]
+            weekly_totals.append(
+                {"week_start": week_start.isoformat(), "week_end": week_end.isoformat(), **totals}
+            )
+
+        return {
+            "daily_minutes_last_7_days": daily_minutes,
+            "weekly_totals_last_4_weeks": weekly_totals,
+            "top_activities": [
+                {"name": name, "count": count}
+                for name, count in state["activity_counts"].most_common(TOP_ACTIVITIES)
+                if count > 0
+            ],
+            "active_days": len(days),
+            "total_sessions": sum(state["activity_counts"].values()),
+        }
+
+
+activity_history = ActivityHistoryStore(
+    lookback_days=ACTIVITY_HISTORY_LOOKBACK_DAYS, max_users=ACTIVITY_HISTORY_MAX_USERS
+)
@@ -0,0 +1,272 @@
+# src/services/answer_cache.py
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict, defaultdict
+from config import (
+    ANSWER_CACHE_TTL,
+    ANSWER_CACHE_MAX_ENTRIES,
+    ANSWER_CACHE_SIMILARITY,
+    ANSWER_CACHE_SNAPSHOT,
+)
+
+logger = logging.getLogger(__name__)
+
+NGRAM = 3
+
+# Kemiripan trigram minimal agar dua kata dianggap sama (toleransi salah ketik)
+TOKEN_SIMILARITY = 0.5
+
+# Kata tanya dan kata sambung yang tidak mengubah isi pertanyaan
+STOPWORDS = {
+    "apa", "apakah", "bagaimana", "gimana", "gmn", "cara", "caranya", "kah",
+    "di", "ke", "dari", "saat", "pada", "ketika", "pas", "selama", "yang", "untuk",
+    "buat", "dengan", "dan", "atau", "ya", "dong", "sih", "kok", "nya", "ga", "gak",
+    "ibu", "bu", "bunda", "mom", "hamil", "sedang", "aman", "amankah", "boleh",
+    "bolehkah", "bisa", "bisakah", "medibot", "tolong", "mohon",
+}
+
+
+def normalize_question(text: str) -> str:
+    """
+    Kata isi pertanyaan (tanpa tanda baca dan stopword) dengan urutan asli,
+    karena urutan di sekitar kata seperti "sebelum" mengubah makna.
+    """
+    words = re.sub(r"[^\w\s]", " ", text.lower()).split()
+    return " ".join(word for word in words if word not in STOPWORDS)
+
+
+def _ngrams(word: str) -> set[str]:
+    padded = f" {word} "
+    return {padded[i : i + NGRAM] for i in range(max(len(padded) - NGRAM + 1, 1))}
+
+
+# Kata yang mengubah makna jawaban (batas, negasi, urutan waktu) harus sama persis
+MUST_MATCH = {
+    "maksimal", "maksimum", "minimal", "minimum", "maks", "min", "tidak", "jangan",
+    "bukan", "belum", "tanpa", "lebih", "kurang", "sebelum", "sesudah", "setelah",
+}
+
+
+def _token_matches(word: str, candidates: list[str]) -> bool:
+    if word in candidates:
+        return True
+    # Angka harus sama persis, misal "trimester 1" tidak cocok dengan "trimester 3"
+    if word.isdigit() or word in MUST_MATCH:
+        return False
+    grams = _ngrams(word)
+    for candidate in candidates:
+        if candidate.isdigit() or candidate in MUST_MATCH:
+            continue
+        other = _ngrams(candidate)
+        if len(grams & other) / len(grams | other) >= TOKEN_SIMILARITY:
+            return True
+    return False
+
+
+def _segments(words: list[str]) -> tuple[list[str], list[list[str]]]:
+    """Pisahkan pertanyaan pada kata MUST_MATCH: urutan kata tersebut dan kelompok kata di antaranya."""
+    markers, groups = [], [[]]
+    for word in words:
+        if word in MUST_MATCH:
+            markers.append(word)
+            groups.append([])
+        else:
+            groups[-1].append(word)
+    return markers, groups
+
+
+def _similarity(words: list[str], other: list[str]) -> float:
+    """
+    Proporsi kata yang sama persis terhadap pertanyaan yang lebih panjang.
+    Bernilai 0 jika ada kata di salah satu pertanyaan yang tidak punya
+    pasangan persis atau salah ketik, sehingga pertanyaan yang berbeda satu
+    kata (misal "dosis asam folat" vs "dosis asam folat maksimal") tidak cocok.
+    Pasangan dicari per kelompok di antara kata MUST_MATCH yang urutannya
+    harus sama, sehingga "minum susu sebelum makan obat" tidak cocok dengan
+    "makan obat sebelum minum susu".
+    """
+    if not words or not other:
+        return 0.0
+    markers, groups = _segments(words)
+    other_markers, other_groups = _segments(other)
+    if markers != other_markers:
+        return 0.0
+    for group, other_group in zip(groups, other_groups):
+        if not all(_token_matches(word, other_group) for word in group):
+            return 0.0
+        if not all(_token_matches(word, group) for word in other_group):
+            return 0.0
+    return len(set(words) & set(other)) / max(len(words), len(other))
+
+
+class AnswerCache:
+    """
+    Cache jawaban MediBot untuk pertanyaan yang tidak bergantung pada pengguna.
+
+    Pertanyaan dinormalisasi menjadi urutan kata isi lalu dicari lewat hash.
+    Jika `similarity` < 1 dan tidak ada yang sama persis, pertanyaan tersimpan
+    dipakai bila setiap katanya berpasangan dengan kata yang sama atau salah
+    ketik (kecuali angka dan MUST_MATCH yang harus sama persis) dan proporsi
+    kata yang sama persis minimal `similarity`. `similarity` >= 1 (default)
+    hanya memakai pencocokan persis. Entri disimpan
+    LRU dengan TTL dan dapat disimpan ke file snapshot JSON (berkala dan saat
+    shutdown) agar tidak hilang ketika service dijalankan ulang atau mati.
+    """
+
+    def __init__(self, ttl: float, max_entries: int, similarity: float, snapshot_path: str | None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.similarity = similarity
+        self.snapshot_path = snapshot_path
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        # trigram kata -> key entri yang mengandungnya, untuk mencari kandidat mirip
+        self._index: dict[str, set[str]] = defaultdict(set)
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        # Ada entri baru sejak snapshot terakhir ditulis
+        self._dirty = False
+
+    @staticmethod
+    def _grams(normalized: str) -> set[str]:
+        return {gram for word in normalized.split() for gram in _ngrams(word)}
+
+    @staticmethod
+    def _key(normalized: str) -> str:
+        return hashlib.sha256(normalized.encode()).hexdigest()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for gram in self._grams(entry["question"]):
+            keys = self._index.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._index[gram]
+
+    def _insert(self, key: str, entry: dict) -> None:
+        self._remove(key)
+        self._entries[key] = entry
+        for gram in self._grams(entry["question"]):
+            self._index[gram].add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _live(self, key: str) -> dict | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry["expires_at"] <= time.time():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _most_similar(self, normalized: str) -> dict | None:
+        words = normalized.split()
+        candidates = set()
+        for gram in self._grams(normalized):
+            candidates.update(self._index.get(gram, ()))
+
+        best_key, best_score = None, self.similarity
+        for key in candidates:
+            score = _similarity(words, self._entries[key]["question"].split())
+            if score >= best_score:
+                best_key, best_score = key, score
+        return self._live(best_key) if best_key is not None else None
+
+    def lookup(self, question: str) -> str | None:
+        normalized = normalize_question(question)
+        entry = self._live(self._key(normalized))
+        if entry is not None:
+            self.hits += 1
+            return entry["answer"]
+        if self.similarity < 1:
+            entry = self._most_similar(normalized)
+            if entry is not None:
+                self.similar_hits += 1
+                return entry["answer"]
+        self.misses += 1
+        return None
+
+    def store(self, question: str, answer: str) -> None:
+        normalized = normalize_question(question)
+        if not normalized or not answer:
+            return
+        self._insert(
+            self._key(normalized),
+            {
+                "question": normalized,
+                "answer": answer,
+                "expires_at": time.time() + self.ttl,
+            },
+        )
+        self._dirty = True
+
+    def _read_snapshot(self) -> list[dict]:
+        try:
+            with open(self.snapshot_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Snapshot cache jawaban tidak dapat dibaca: %s", e)
+            return []
+
+    def load(self) -> None:
+        """Muat snapshot (entri kadaluarsa dilewati)."""
+        if not self.snapshot_path:
+            return
+        now = time.time()
+        for entry in self._read_snapshot():
+            if entry.get("expires_at", 0) > now:
+                self._insert(self._key(entry["question"]), entry)
+
+    def save(self) -> None:
+        """
+        Tulis snapshot secara atomik (file sementara lalu rename). Entri yang
+        sudah ditulis worker lain ke snapshot yang sama ikut dipertahankan.
+        """
+        if not self.snapshot_path:
+            return
+        now = time.time()
+        merged = {entry["question"]: entry for entry in self._read_snapshot()}
+        merged.update((entry["question"], entry) for entry in self._entries.values())
+        entries = [entry for entry in merged.values() if entry.get("expires_at", 0) > now]
+
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entries[-self.max_entries :], f, ensure_ascii=False)
+        os.replace(tmp_path, self.snapshot_path)
+        self._dirty = False
+
+    async def save_periodically(self, interval: float) -> None:
+        """Tulis snapshot setiap `interval` detik bila ada entri baru; berjalan sampai dibatalkan."""
+        if not self.snapshot_path or interval <= 0:
+            return
+        while True:
+            await asyncio.sleep(interval)
+            if not self._dirty:
+                continue
+            try:
+                self.save()
+            except OSError as e:
+                logger.warning("Snapshot cache jawaban gagal ditulis: %s", e)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "similar_hits": self.similar_hits, "misses": self.misses}
+
+
+answer_cache = AnswerCache(
+    ttl=ANSWER_CACHE_TTL,
+    max_entries=ANSWER_CACHE_MAX_ENTRIES,
+    similarity=ANSWER_CACHE_SIMILARITY,
+    snapshot_path=ANSWER_CACHE_SNAPSHOT or None,
+)
@@ -0,0 +1,105 @@
+# src/services/chat_intent.py
+import re
+
+# Bagian konteks pengguna dan key USER_DATA_ENDPOINTS yang dimuat untuk tiap bagian
+SECTION_KEYS = {
+    # user_nutrition_need juga berisi trimesterNumber
+    "profile": ["user_profile", "user_nutrition_need"],
+    "nutrition": ["user_food_track", "user_nutrition_summary", "user_nutrition_need"],
+    "activity": ["user_activity_track", "user_activity_today"],
+}
+
+# Kata kunci (dicocokkan sebagai awal kata) yang menandakan pertanyaan butuh data nutrisi/aktivitas
+SECTION_KEYWORDS = {
+    "nutrition": [
+        "makan", "dimakan", "nutrisi", "gizi", "besi", "folat", "kalsium", "protein",
+        "vitamin", "omega", "serat", "yodium", "lemak", "sarapan", "asupan", "minum",
+        "air putih", "sayur", "buah", "susu", "lapar", "diet", "food", "eat", "nutrition",
+    ],
+    "activity": [
+        "olahraga", "aktivitas", "senam", "yoga", "renang", "berenang", "latihan",
+        "gerak", "jalan kaki", "jalan santai", "berjalan", "lari", "kalori", "langkah",
+        "capek", "lelah", "exercise", "workout",
+    ],
+}
+
+# Pertanyaan seputar penggunaan aplikasi cukup dijawab dari deskripsi aplikasi
+# (dicocokkan sebagai kata utuh agar "profil" tidak cocok dengan "profilnya" dsb.)
+APP_KEYWORDS = [
+    "aplikasi", "fitur", "laman", "halaman", "tombol", "klik", "pengingat", "reminder",
+    "notifikasi", "akun", "login", "daftar", "profil", "kontak", "darurat",
+    "dashboard", "pantausikecil",
+]
+
+
+# Penanda pertanyaan yang bergantung pada data pribadi, waktu, atau percakapan sebelumnya,
+# termasuk kata penunjuk seperti "trimester ini" atau "saat ini"
+PERSONAL_KEYWORDS = [
+    "saya", "aku", "gue", "gw", "hari ini", "tadi", "kemarin", "sekarang", "saat ini",
+    "minggu ini", "ini", "data", "riwayat", "target", "progres",
+]
+FOLLOW_UP_KEYWORDS = [
+    "lalu", "terus", "kalau begitu", "kalau gitu", "itu", "tersebut", "yang mana",
+    "bagaimana dengan", "selain itu", "tadi", "lagi",
+]
+
+
+def _compile(keywords: list[str], whole_word: bool = False) -> re.Pattern:
+    end = r"\b" if whole_word else ""
+    return re.compile(
+        r"\b(?:" + "|".join(re.escape(keyword) for keyword in keywords) + ")" + end
+    )
+
+
+# Bagian yang jawabannya bergantung pada data pengguna (alergi, kondisi medis, catatan harian)
+USER_DEPENDENT_SECTIONS = {"nutrition", "activity"}
+
+_SECTION_PATTERNS = {section: _compile(words) for section, words in SECTION_KEYWORDS.items()}
+_APP_PATTERN = _compile(APP_KEYWORDS, whole_word=True)
+_FOLLOW_UP_PATTERN = _compile(FOLLOW_UP_KEYWORDS)
+# Termasuk akhiran kepemilikan, misal "makananku"
+_PERSONAL_PATTERN = re.compile(_compile(PERSONAL_KEYWORDS).pattern + r"|\w(?:ku|mu)\b")
+# Trimester yang disebut eksplisit, misal "trimester 2" atau "trimester kedua"
+_TRIMESTER_PATTERN = re.compile(r"\btrimester\s*(?:[123]|i{1,3}|pertama|kedua|ketiga)\b")
+
+
+def classify_sections(message: str) -> list[str]:
+    """
+    Tentukan bagian konteks pengguna yang dibutuhkan pertanyaan, tanpa model.
+
+    Pertanyaan nutrisi/aktivitas juga memuat profil (alergi, trimester).
+    Pertanyaan yang menyebut diri sendiri atau data pribadi selalu memuat
+    profil. Pertanyaan penggunaan aplikasi lainnya tidak memuat apa pun;
+    pertanyaan umum lainnya hanya memuat profil.
+    """
+    text = message.lower()
+    sections = [section for section, pattern in _SECTION_PATTERNS.items() if pattern.search(text)]
+    if sections:
+        return sections + ["profile"]
+    if _PERSONAL_PATTERN.search(text):
+        return ["profile"]
+    if _APP_PATTERN.search(text):
+        return []
+    return ["profile"]
+
+
+def section_keys(sections: list[str]) -> list[str]:
+    """Key USER_DATA_ENDPOINTS untuk bagian-bagian tersebut, tanpa duplikat."""
+    return list(dict.fromkeys(key for section in sections for key in SECTION_KEYS[section]))
+
+
+def is_generic_question(message: str) -> bool:
+    """
+    Pertanyaan yang jawabannya sama untuk semua pengguna: bukan pertanyaan
+    lanjutan, tidak menyebut diri sendiri atau data/waktu pribadi, dan tidak
+    membutuhkan bagian nutrisi/aktivitas (yang jawabannya memperhitungkan
+    alergi dan kondisi medis) kecuali trimesternya disebut eksplisit.
+    Pemeriksaan orang pertama mendahului apa pun agar pertanyaan tersebut
+    tidak pernah masuk cache jawaban bersama, termasuk pertanyaan aplikasi.
+    """
+    text = message.lower()
+    if _FOLLOW_UP_PATTERN.search(text) or _PERSONAL_PATTERN.search(text):
+        return False
+    if USER_DEPENDENT_SECTIONS.intersection(classify_sections(message)):
+        return bool(_TRIMESTER_PATTERN.search(text))
+    return True
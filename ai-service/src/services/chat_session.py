@@ -0,0 +1,176 @@
+# src/services/chat_session.py
+import json
+import secrets
+import time
+from config import (
+    CHAT_SESSION_BACKEND,
+    CHAT_SESSION_TTL,
+    CHAT_SESSION_MAX,
+    CHAT_CONTEXT_TTL,
+    CHAT_HISTORY_TOKEN_BUDGET,
+    CHAT_SUMMARY_MAX_CHARS,
+    CHAT_LAZY_CONTEXT,
+)
+from services.chat_intent import SECTION_KEYS, classify_sections, section_keys
+from services.kv_store import create_backend
+from services.user_data import fetch_user_data_keys
+from utils.auth import token_fingerprint
+from utils.tokens import estimate_tokens
+
+# Panjang maksimum satu giliran percakapan ketika dipadatkan ke ringkasan
+SUMMARY_TURN_CHARS = 160
+
+
+class ChatSessionManager:
+    """
+    Sesi percakapan MediBot.
+
+    Setiap sesi menyimpan salinan bagian konteks pengguna yang pernah
+    dibutuhkan (masing-masing diperbarui setelah `context_ttl` detik), giliran
+    percakapan terakhir, dan ringkasan bergulir. Ketika giliran melebihi
+    `token_budget`, giliran tertua dipadatkan ke ringkasan secara lokal tanpa
+    panggilan model.
+
+    Jika `lazy` aktif, bagian konteks yang dimuat ditentukan dari pertanyaan
+    (lihat chat_intent); selain itu seluruh bagian selalu dimuat.
+    """
+
+    def __init__(
+        self, backend, session_ttl: float, context_ttl: float, token_budget: int, lazy: bool
+    ):
+        self.backend = backend
+        self.session_ttl = session_ttl
+        self.context_ttl = context_ttl
+        self.token_budget = token_budget
+        self.lazy = lazy
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"chat:{session_id}"
+
+    def _sections(self, session: dict | None, message: str) -> list[str]:
+        if not self.lazy:
+            return list(SECTION_KEYS)
+        # Pertanyaan lanjutan ("kalau begitu, yang mana?") memakai bagian dari pertanyaan sebelumnya
+        previous = ""
+        if session is not None:
+            user_turns = [turn["text"] for turn in session["turns"] if turn["role"] == "user"]
+            previous = user_turns[-1] if user_turns else ""
+        return classify_sections(f"{previous}\n{message}")
+
+    async def open(
+        self,
+        session_id: str | None,
+        token: str,
+        message: str,
+        sections: list[str] | None = None,
+    ) -> dict:
+        """
+        Muat sesi yang ada (atau buat baru) dan pastikan bagian konteks yang
+        dibutuhkan `message` (atau `sections`, jika diberikan) sudah dimuat dan
+        masih segar. Hanya bagian yang belum ada atau kadaluarsa yang diambil
+        dari backend, dalam satu kali jalan.
+        """
+        session = None
+        if session_id:
+            value = await self.backend.get(self._key(session_id))
+            session = json.loads(value) if value else None
+
+        if sections is None:
+            sections = self._sections(session, message)
+        keys = section_keys(sections)
+        token_hash = token_fingerprint(token)
+        now = time.time()
+        loaded = (
+            session.get("loaded", {})
+            if session is not None and session["token_hash"] == token_hash
+            else {}
+        )
+        missing = [key for key in keys if now - loaded.get(key, 0) >= self.context_ttl]
+
+        if session is not None and session["token_hash"] == token_hash and not missing:
+            session["sections"] = sections
+            return session
+
+        # Tetap dipanggil meski `missing` kosong untuk memastikan token milik pengguna sesi
+        fetched = await fetch_user_data_keys(token, missing)
+        if session is None or session["user_id"] != fetched.get("user_id"):
+            # Sesi milik pengguna lain atau tidak ditemukan: mulai sesi baru
+            session = {
+                "id": secrets.token_urlsafe(16),
+                "user_id": fetched.get("user_id"),
+                "summary": "",
+                "turns": [],
+                "context": {},
+            }
+            loaded = {}
+        session["token_hash"] = token_hash
+        session["context"].update({key: fetched[key] for key in missing})
+        session["loaded"] = {**loaded, **dict.fromkeys(missing, now)}
+        session["sections"] = sections
+        return session
+
+    @staticmethod
+    def prompt_context(session: dict) -> dict:
+        """Bagian konteks yang dibutuhkan pertanyaan saat ini saja."""
+        return {
+            key: session["context"][key]
+            for key in section_keys(session["sections"])
+            if key in session["context"]
+        }
+
+    async def record(self, session: dict, message: str, reply: str) -> None:
+        session["turns"].append({"role": "user", "text": message})
+        session["turns"].append({"role": "model", "text": reply})
+        self._compact(session)
+        await self.backend.set(
+            self._key(session["id"]),
+            json.dumps(session, ensure_ascii=False, default=str),
+            self.session_ttl,
+        )
+
+    def _compact(self, session: dict) -> None:
+        turns = session["turns"]
+        compacted = []
+        # Sisakan minimal satu pasang giliran terakhir secara utuh
+        while (
+            len(turns) > 2
+            and sum(estimate_tokens(turn["text"]) for turn in turns) > self.token_budget
+        ):
+            turn = turns.pop(0)
+            speaker = "Pengguna" if turn["role"] == "user" else "MediBot"
+            text = " ".join(turn["text"].split())
+            if len(text) > SUMMARY_TURN_CHARS:
+                text = text[:SUMMARY_TURN_CHARS].rstrip() + "..."
+            compacted.append(f"- {speaker}: {text}")
+
+        if compacted:
+            summary = "\n".join(filter(None, [session["summary"], *compacted]))
+            if len(summary) > CHAT_SUMMARY_MAX_CHARS:
+                # Buang baris ringkasan tertua terlebih dahulu
+                summary = summary[-CHAT_SUMMARY_MAX_CHARS:]
+                summary = summary[summary.find("\n") + 1:] if "\n" in summary else summary
+            session["summary"] = summary
+
+    @staticmethod
+    def history_prompt(session: dict) -> str:
+        """Ringkasan dan giliran terakhir sebagai teks untuk prompt."""
+        parts = []
+        if session["summary"]:
+            parts.append(f"Ringkasan percakapan sebelumnya:\n{session['summary']}")
+        if session["turns"]:
+            lines = [
+                f"{'Pengguna' if turn['role'] == 'user' else 'MediBot'}: {turn['text']}"
+                for turn in session["turns"]
+            ]
+            parts.append("Percakapan terakhir:\n" + "\n".join(lines))
+        return "\n\n".join(parts)
+
+
+chat_sessions = ChatSessionManager(
+    create_backend(CHAT_SESSION_BACKEND, "chat_sessions", CHAT_SESSION_MAX),
+    session_ttl=CHAT_SESSION_TTL,
+    context_ttl=CHAT_CONTEXT_TTL,
+    token_budget=CHAT_HISTORY_TOKEN_BUDGET,
+    lazy=CHAT_LAZY_CONTEXT,
+)
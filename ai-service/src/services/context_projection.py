@@ -0,0 +1,141 @@
+# src/services/context_projection.py
+import json
+import logging
+from services.food_candidates import unwrap
+from utils.metrics import prompt_context_bytes
+from utils.tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+NUTRIENTS = (
+    "protein",
+    "folicAcid",
+    "iron",
+    "calcium",
+    "vitaminD",
+    "omega3",
+    "fiber",
+    "iodine",
+    "fat",
+    "vitaminB",
+)
+
+# Proyeksi tiap key konteks sebelum dimasukkan ke prompt. Spec berupa:
+#   True            -> nilai disimpan apa adanya
+#   None            -> key dibuang
+#   (field, ...)    -> hanya field tersebut yang disimpan
+#   {field: spec}   -> field diproyeksikan secara rekursif
+# List diproyeksikan per elemen; key yang tidak terdaftar disimpan apa adanya.
+BASE_PROJECTION = {
+    "user_id": None,
+    "user_data": None,
+    "user_profile": (
+        "fullName",
+        "age",
+        "isVegetarian",
+        "financialStatus",
+        "allergy",
+        "medicalCondition",
+    ),
+    "user_food_track": {"mealCategory": True, "food": ("foodName",)},
+    "user_nutrition_summary": tuple(
+        f"total{nutrient[0].upper()}{nutrient[1:]}" for nutrient in NUTRIENTS
+    )
+    + ("totalWaterMl",),
+    "user_nutrition_need": ("trimesterNumber", "waterNeedsMl")
+    + tuple(f"{nutrient}Needs" for nutrient in NUTRIENTS),
+    "user_activity_today": {
+        "date": True,
+        "totalDurationMinutes": True,
+        "totalCalories": True,
+        "activities": ("activityName", "durationMinutes"),
+    },
+    "user_activity_track": True,
+    "user_activity_history": True,
+    "database-activity": (
+        "id",
+        "activityName",
+        "estimatedDuration",
+        "caloriesPerHour",
+        "level",
+    ),
+}
+
+# Katalog makanan dikirim sebagai tabel kandidat terpisah (lihat food_candidates)
+SEPARATE_KEYS = ("database-food",)
+
+PROJECTIONS = {
+    "chat": BASE_PROJECTION,
+    "food": BASE_PROJECTION,
+    # Rekomendasi aktivitas hanya butuh trimester dari data kebutuhan nutrisi
+    "activity": {**BASE_PROJECTION, "user_nutrition_need": ("trimesterNumber",)},
+}
+
+
+def _is_empty(value) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def project(value, spec):
+    if spec is True:
+        return value
+    if isinstance(value, list):
+        return [project(item, spec) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if isinstance(spec, tuple):
+        spec = dict.fromkeys(spec, True)
+
+    projected = {}
+    for field, field_spec in spec.items():
+        if field not in value or field_spec is None:
+            continue
+        field_value = project(value[field], field_spec)
+        if not _is_empty(field_value):
+            projected[field] = field_value
+    return projected
+
+
+def project_context(context: dict, kind: str) -> dict:
+    """Buang envelope backend dan field yang tidak dipakai model untuk jenis prompt `kind`."""
+    projection = PROJECTIONS[kind]
+    projected = {}
+    for key, value in context.items():
+        spec = projection.get(key, True)
+        if spec is None or key in SEPARATE_KEYS:
+            continue
+        value = project(unwrap(value), spec)
+        if not _is_empty(value):
+            projected[key] = value
+    return projected
+
+
+def compact_context(context: dict, kind: str) -> str:
+    """
+    Serialisasi konteks pengguna yang sudah diproyeksikan sebagai JSON ringkas
+    untuk prompt. Ukuran sesudah proyeksi dicatat ke histogram
+    `ai_prompt_context_bytes`; ukuran sebelumnya (repr dict mentah) hanya
+    dihitung saat log debug aktif karena serialisasinya mahal.
+    """
+    compact = json.dumps(
+        project_context(context, kind),
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str,
+    )
+
+    compact_size = len(compact.encode())
+    prompt_context_bytes.observe(compact_size, kind=kind, stage="projected")
+    if logger.isEnabledFor(logging.DEBUG):
+        raw = str({key: value for key, value in context.items() if key not in SEPARATE_KEYS})
+        raw_size = len(raw.encode())
+        prompt_context_bytes.observe(raw_size, kind=kind, stage="raw")
+        logger.debug(
+            "Konteks %s: %d -> %d byte (~%d -> ~%d token)",
+            kind,
+            raw_size,
+            compact_size,
+            estimate_tokens(raw),
+            estimate_tokens(compact),
+        )
+    return compact
@@ -0,0 +1,173 @@
+# src/services/food_candidates.py
+import re
+import numpy as np
+from config import FOOD_CANDIDATES_PER_MEAL
+
+# (field makanan, field kebutuhan, field ringkasan harian, label kolom)
+KEY_NUTRIENTS = [
+    ("iron", "ironNeeds", "totalIron", "zat_besi"),
+    ("folicAcid", "folicAcidNeeds", "totalFolicAcid", "asam_folat"),
+    ("calcium", "calciumNeeds", "totalCalcium", "kalsium"),
+    ("vitaminD", "vitaminDNeeds", "totalVitaminD", "vitamin_d"),
+    ("protein", "proteinNeeds", "totalProtein", "protein"),
+    ("fiber", "fiberNeeds", "totalFiber", "serat"),
+]
+
+MEALS = ("breakfast", "lunch", "dinner")
+
+# Batas jumlah mask alergen per katalog sebelum mask dibuang dan dihitung ulang
+MAX_ALLERGEN_MASKS = 256
+
+# Indeks katalog terakhir: matriks nutrisi, teks nama+deskripsi (huruf kecil), dan
+# mask alergen per kata kunci. Katalog dari catalog_cache adalah objek yang sama
+# selama versinya tidak berubah sehingga indeks tidak perlu dibangun ulang.
+_catalog_index: dict | None = None
+
+
+def unwrap(payload):
+    """Ambil isi `data` dari envelope respons backend ({success, message, data})."""
+    if isinstance(payload, dict) and "data" in payload:
+        return payload["data"]
+    return payload
+
+
+def nutrient_vector(source: dict | None, keys: list[str]) -> np.ndarray:
+    source = source or {}
+    return np.array([float(source.get(key) or 0) for key in keys])
+
+
+def _index(foods: list[dict]) -> dict:
+    global _catalog_index
+    if _catalog_index is not None and _catalog_index["foods"] is foods:
+        return _catalog_index
+
+    food_keys = [nutrient[0] for nutrient in KEY_NUTRIENTS]
+    matrix = np.array(
+        [[float(food.get(key) or 0) for key in food_keys] for food in foods],
+        dtype=float,
+    ).reshape(len(foods), len(food_keys))
+    texts = np.array(
+        [f"{food.get('foodName') or ''} {food.get('description') or ''}".lower() for food in foods],
+        dtype=str,
+    )
+    _catalog_index = {
+        "foods": foods,
+        "matrix": matrix,
+        "ids": [food.get("id") for food in foods],
+        "names": [food.get("foodName") for food in foods],
+        "texts": texts,
+        "allergen_masks": {},
+    }
+    return _catalog_index
+
+
+def food_matrix(foods: list[dict]) -> tuple[np.ndarray, list, list]:
+    """Proyeksikan katalog menjadi (matriks nutrisi n x k, id, nama)."""
+    index = _index(foods)
+    return index["matrix"], index["ids"], index["names"]
+
+
+# Isi kolom alergi yang berarti tidak ada alergi
+NO_ALLERGY = {"", "-", "tidak", "tidak ada", "tidak punya", "none", "null", "nihil"}
+
+
+def allergy_terms(profile: dict | None) -> list[str]:
+    """Pecah teks `allergy` profil (misal "udang, kacang dan susu") menjadi kata kunci."""
+    text = str((profile or {}).get("allergy") or "").lower()
+    parts = re.split(r"[,;/\n]|\bdan\b|\batau\b", text)
+    return [part.strip() for part in parts if part.strip() not in NO_ALLERGY]
+
+
+def allergen_mask(foods: list[dict], term: str) -> np.ndarray:
+    """Mask makanan yang nama/deskripsinya menyebut `term`, di-cache bersama indeks katalog."""
+    index = _index(foods)
+    masks = index["allergen_masks"]
+    mask = masks.get(term)
+    if mask is None:
+        if len(masks) >= MAX_ALLERGEN_MASKS:
+            masks.clear()
+        mask = masks[term] = np.char.find(index["texts"], term) >= 0
+    return mask
+
+
+def allowed_foods(foods: list[dict], terms: list[str]) -> np.ndarray:
+    """Mask makanan yang nama/deskripsinya tidak menyebut alergen pengguna."""
+    allowed = np.ones(len(foods), dtype=bool)
+    for term in terms:
+        allowed &= ~allergen_mask(foods, term)
+    return allowed
+
+
+def nutrient_deficit(need: dict | None, summary: dict | None) -> tuple[np.ndarray, np.ndarray]:
+    """Kembalikan (kebutuhan, sisa kebutuhan) untuk nutrisi utama."""
+    needs = nutrient_vector(need, [nutrient[1] for nutrient in KEY_NUTRIENTS])
+    consumed = nutrient_vector(summary, [nutrient[2] for nutrient in KEY_NUTRIENTS])
+    return needs, np.maximum(needs - consumed, 0)
+
+
+def score_foods(matrix: np.ndarray, needs: np.ndarray, deficit: np.ndarray) -> np.ndarray:
+    """
+    Skor tiap makanan = jumlah porsi sisa kebutuhan yang bisa ditutupi.
+    Nutrisi dinormalisasi terhadap kebutuhan harian agar satuan berbeda
+    (mg, mcg, g) sebanding, dan kelebihan di atas sisa kebutuhan tidak dihitung.
+    """
+    scale = np.where(needs > 0, needs, 1.0)
+    coverage = matrix / scale
+    remaining = deficit / scale
+    if not remaining.any():
+        # Semua kebutuhan terpenuhi: urutkan berdasarkan kepadatan nutrisi saja
+        return coverage.sum(axis=1)
+    return np.minimum(coverage, remaining).sum(axis=1)
+
+
+def select_candidates(context: dict, per_meal: int = FOOD_CANDIDATES_PER_MEAL) -> list[dict]:
+    """
+    Pilih makanan kandidat dari database-food untuk prompt rekomendasi.
+
+    Katalog tidak memiliki kategori waktu makan, sehingga diambil
+    `per_meal` kandidat untuk setiap waktu makan (sarapan, makan siang,
+    makan malam) dari peringkat yang sama. Makanan yang mengandung alergen
+    dari profil pengguna dibuang sebelum peringkat dibuat.
+    """
+    foods = unwrap(context.get("database-food")) or []
+    if not foods:
+        return []
+
+    matrix, ids, names = food_matrix(foods)
+    needs, deficit = nutrient_deficit(
+        unwrap(context.get("user_nutrition_need")),
+        unwrap(context.get("user_nutrition_summary")),
+    )
+    scores = score_foods(matrix, needs, deficit)
+    # Makanan yang menyebut alergen pengguna tidak masuk tabel kandidat sama sekali
+    allowed = allowed_foods(foods, allergy_terms(unwrap(context.get("user_profile"))))
+    scores = np.where(allowed, scores, -np.inf)
+
+    limit = min(per_meal * len(MEALS), int(allowed.sum()))
+    if limit == 0:
+        return []
+    top = np.argpartition(-scores, limit - 1)[:limit]
+    top = top[np.argsort(-scores[top], kind="stable")]
+
+    labels = [nutrient[3] for nutrient in KEY_NUTRIENTS]
+    return [
+        {"id": ids[i], "nama": names[i], **dict(zip(labels, matrix[i].tolist()))}
+        for i in top
+    ]
+
+
+def format_candidate_table(candidates: list[dict]) -> str:
+    """Serialisasi kandidat sebagai tabel ringkas dipisah `|` untuk prompt."""
+    if not candidates:
+        return "(tidak ada makanan di database)"
+
+    columns = list(candidates[0])
+    rows = ["|".join(columns)]
+    for candidate in candidates:
+        rows.append(
+            "|".join(
+                f"{value:g}" if isinstance(value, float) else str(value)
+                for value in (candidate[column] for column in columns)
+            )
+        )
+    return "\n".join(rows)
@@ -1,270 +1,308 @@
 # src/services/gemini_service.py
+import asyncio
+import logging
+import time
 import google.generativeai as genai
-import os
-from config import GEMINI_API_KEY
-
-app_desc = """
-PantauSiKecil adalah sebuah aplikasi mobile berbasis AI yang dirancang untuk mendampingi ibu hamil secara cerdas dan menyeluruh. Aplikasi ini menghadirkan fitur pengingat konsultasi, rekomendasi nutrisi dan aktivitas fisik berbasis kondisi kehamilan, chatbot medis 24/7, hingga tombol darurat yang terhubung ke fasilitas kesehatan dan keluarga.
-
-Dengan pendekatan berbasis data dan teknologi machine learning, PantauSiKecil bertujuan meningkatkan kualitas kesehatan ibu dan janin sejak awal kehamilan hingga persalinan, sekaligus mendukung aksesibilitas layanan kesehatan yang inklusif dan terintegrasi.
-
-1. Laman Login dan Registrasi.
-Jika akun belum terdaftar maka harus ke laman registrasi dengan mendaftarkan username, email, password. Dapat juga masuk dengan kun Google. 
-2. Buat data kehamilan baru, jika baru pertama kali menggunakan aplikasi atau sudah selesai dengan kehamilan sebelumnya dan hamil anak selanjutnya
-Pakai data kehamilan yang sudah ada, jika memang ingin memakai data yang sudah pernah disimpan 
-3. Pada laman Beranda, berisi reminder sejak h-3 dari suatu event yang sudah diset oleh pengguna. Dapat dilihat juga insight pemenuhan air dan gizi serta aktivitas yang sudah dipenuhi dan dilakukan pada hari tersebut. Untuk tiap bagian dari nutrisi dan aktivitas dapat diklik dan menuju menu nutrisi dan aktivitas.
-Laman ini juga bisa ke laman isi tambah pengingat dengan menekan tombol + yang ada di pojok kanan atas. 
-
-4. Laman Tambah Pengingat, diisi dengan nama, deskripsi, tanggal, dan durasi dari pengingat yang akan ditampilkan juga memberi notifikasi pada pengguna. Contoh aktivitas yang bisa ditambahkan, jadwal konsultasi, reminder konsumsi suplemen, dan lainnya.
-
-5. Tersedia navbar pada tiap laman yang berupa beranda, nutrisi, mendibot, aktivitas, dan bantuan. Setiap menu ini akan menampilkan laman yang sesuai dengan pilihannya.
-6. Laman Nutrisi, berisi pemenuhan air dan nutrisi yang sudah dipenuhi beserta targetnya. Pengguna dapat klik info nutrisi agar melihat detail nutrisi lebih detail yang berisi: asam folat, zat besi, kalsium, protein, vitamin D, omega3, yodium, lemak, dan vitamin B. Seluruh target yang ada sudah disesuaikan engan trimester kehamilan dari pengguna. 
-Pemenuhan ini berasal dari makanan yang ditambahkan oleh pengguna dengan menekan tombol + pada catatan makanan yang dikategorikan sesuai kategorinya yaitu sarapan, makan siang, makan malam, cemilan pagi, atau cemilan sore. Pengguna kemudian apat mencari nama makanan kemudian mengklik nama makanan yang sesuai. Kemudian informasi nutrisi akan terupdate.
-Demikian juga untuk bagian minum, pengguna tinggal klik minum (diasumsikan 1 gelas = 200ml) kemdudian data pemenuhan air harian akan terupdate bertambah 200ml. Tersedia juga Rekomendasi makanan. tombol tersebut dapat diklik dan muncul beberapa rekomendasi makanan sesuai kategorinya. Rekomendasi tersebut disajikan dalam bentuk card yang dapat diklik dan akan berisi gambar, deskripsi, gizi, dan tips tambahan dari makanan itu.
-Pengguna dapat juga memilih tanggal pada tombol "pilih tanggal" untuk melihat history dulu.
-
-7. Laman Aktivitas, Pengguna dapat melihat informasi aktivitas yang sudah dilakukan hari ini, juga bisa menambahkan aktivitas engan mencari Namanya kemudian menyesuaikan tingkat ktivitas dan durasinya kemudian klik simpan. Disediakan juga rekomendasi ktivitas yang akan berisi card dan informasi singkat tentang lahraga tersebut yang jika diklik akan berisi video tutorial dan deskripsi, kalori, juga tips dalam melakukannya. Pengguna dapat langsung mempraktikannya dengan klik tombol laukan  kemudian set timer (target durasi) kemudian mulai melakukan. Setelah selesai maka log aktivitas akan terupdate. 
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from google.api_core import exceptions as google_exceptions
+from google.generativeai import caching
+from config import (
+    GEMINI_API_KEY,
+    GEMINI_MODEL,
+    GEMINI_MAX_CONCURRENCY,
+    GEMINI_CONTEXT_CACHE,
+    GEMINI_CONTEXT_CACHE_TTL,
+    GEMINI_TIMEOUT,
+    GEMINI_RETRIES,
+    GEMINI_BREAKER_THRESHOLD,
+    GEMINI_BREAKER_RESET,
+    GEMINI_RATE_BACKEND,
+    GEMINI_RATE_PER_MINUTE,
+    GEMINI_RATE_BURST,
+    GEMINI_RATE_MAX_WAIT,
+    FOOD_PROMPT_SEED,
+)
+from services.food_candidates import select_candidates, format_candidate_table
+from services.context_projection import compact_context
+from services.local_recommender import local_food_recommendation
+from services.kv_store import create_rate_limiter
+from services.prompts import CHAT_SYSTEM_PROMPT, FOOD_SYSTEM_PROMPT, ACTIVITY_SYSTEM_PROMPT
+from utils.metrics import span, record_token_usage
+from utils.resilience import Resilient, CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+
+def configure_gemini() -> None:
+    """Set API key client Gemini; dipanggil sekali per proses saat startup."""
+    genai.configure(api_key=GEMINI_API_KEY)
+
+
+def gemini_model_factory(name: str, system_instruction: str):
+    """
+    Membuat model dengan prefix statis sebagai system instruction.
 
-8. Laman Bantuan, jika terjadi hal bahaya dan mendesak, maka dapat ke menu bantuan untuk klik otombol SOS kemudian notifikasi arurat akan dikirimkan ke rumah sakit terdekat dan ada opsi juga untuk mengabari keluarga sehingga notifikasi juga dikirimkan ke kontak keluarga yang sudah tersimpan (dapat ilihat dan ditambahkan di profile).
+    Jika context caching aktif dan didukung, prefix disimpan sebagai cached
+    content sehingga token-nya tidak diproses ulang pada setiap request.
+    Mengembalikan tuple (model, cached content atau None).
+    """
+    if GEMINI_CONTEXT_CACHE:
+        try:
+            cached_content = caching.CachedContent.create(
+                model=GEMINI_MODEL,
+                display_name=f"pantausikecil-{name}",
+                system_instruction=system_instruction,
+                ttl=timedelta(seconds=GEMINI_CONTEXT_CACHE_TTL),
+            )
+            return genai.GenerativeModel.from_cached_content(cached_content), cached_content
+        except Exception as e:
+            # Misal model tidak mendukung caching atau prefix di bawah batas minimum token
+            logger.info("Context caching tidak tersedia untuk prompt %s: %s", name, e)
+
+    model = genai.GenerativeModel(
+        model_name=GEMINI_MODEL, system_instruction=system_instruction
+    )
+    return model, None
+
+
+_model_factory = gemini_model_factory
+
+
+class StaticPrefix:
+    """Model untuk satu prefix prompt statis, dibuat ulang ketika TTL cache habis."""
+
+    def __init__(self, name: str, system_instruction: str):
+        self.name = name
+        self.system_instruction = system_instruction
+        self._cached_content = None
+        self._model = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _expired(self) -> bool:
+        return self._model is None or time.monotonic() >= self._expires_at
+
+    async def get_model(self):
+        if self._expired():
+            async with self._lock:
+                if self._expired():
+                    await self.refresh()
+        return self._model
+
+    @property
+    def cached(self) -> bool:
+        return self._cached_content is not None
+
+    async def refresh(self) -> None:
+        model, cached_content = await asyncio.to_thread(
+            _model_factory, self.name, self.system_instruction
+        )
+        previous = self._cached_content
+        self._model, self._cached_content = model, cached_content or None
+        # Diperbarui sedikit sebelum cache di sisi Gemini kadaluarsa
+        self._expires_at = time.monotonic() + GEMINI_CONTEXT_CACHE_TTL * 0.9
+        if previous is not None:
+            # Cache lama tetap ditagih sampai TTL-nya habis jika tidak dihapus
+            await asyncio.to_thread(self._delete_cached_content, previous)
+
+    def _delete_cached_content(self, cached_content) -> None:
+        try:
+            cached_content.delete()
+        except Exception as e:
+            logger.warning("Gagal menghapus cached content lama %s: %s", self.name, e)
+
+    def reset(self) -> None:
+        self._model = None
+        self._cached_content = None
+
+
+PREFIXES = {
+    "chat": StaticPrefix("chat", CHAT_SYSTEM_PROMPT),
+    "food": StaticPrefix("food", FOOD_SYSTEM_PROMPT),
+    "activity": StaticPrefix("activity", ACTIVITY_SYSTEM_PROMPT),
+}
+
+
+def set_model_factory(factory) -> None:
+    """Ganti pembuat model (misal model stub lokal untuk pengujian)."""
+    global _model_factory
+    _model_factory = factory
+    for prefix in PREFIXES.values():
+        prefix.reset()
+
+
+async def warm_prompt_caches() -> None:
+    """Siapkan model dan cached content seluruh prefix saat startup."""
+    await asyncio.gather(*(prefix.refresh() for prefix in PREFIXES.values()))
+
+
+async def warm_gemini_connection() -> None:
+    """
+    Buka koneksi client async Gemini lewat count_tokens (tanpa biaya generate)
+    agar request pertama setelah deploy tidak menanggung handshake koneksi.
+    """
+    model = await PREFIXES["chat"].get_model()
+    try:
+        await model.count_tokens_async("ping")
+    except Exception as e:
+        logger.warning("Pemanasan koneksi Gemini gagal: %s", e)
+
+
+def prompt_cache_status() -> dict:
+    return {name: {"cached": prefix.cached} for name, prefix in PREFIXES.items()}
+
+
+# Membatasi jumlah panggilan Gemini yang berjalan bersamaan; sisanya menunggu antrean
+_generation_slots = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+_queue_depth = 0
+_in_flight = 0
+
+
+@asynccontextmanager
+async def generation_slot():
+    """Menunggu slot kosong sebelum memanggil Gemini dan melepasnya setelah selesai."""
+    global _queue_depth, _in_flight
+    _queue_depth += 1
+    try:
+        with span("gemini.queue"):
+            await _generation_slots.acquire()
+    finally:
+        _queue_depth -= 1
+
+    _in_flight += 1
+    try:
+        yield
+    finally:
+        _in_flight -= 1
+        _generation_slots.release()
+
+
+def is_retryable_gemini_error(error: BaseException) -> bool:
+    """Kuota habis (429) dan error server (5xx, termasuk deadline) bersifat sementara."""
+    return isinstance(
+        error, (google_exceptions.TooManyRequests, google_exceptions.ServerError)
+    )
+
+
+gemini_resilience = Resilient(
+    "gemini",
+    timeout=GEMINI_TIMEOUT,
+    retries=GEMINI_RETRIES,
+    retryable=is_retryable_gemini_error,
+    breaker=CircuitBreaker(GEMINI_BREAKER_THRESHOLD, GEMINI_BREAKER_RESET),
+    limiter=create_rate_limiter(
+        GEMINI_RATE_BACKEND,
+        "gemini",
+        GEMINI_RATE_PER_MINUTE / 60,
+        GEMINI_RATE_BURST,
+        GEMINI_RATE_MAX_WAIT,
+    ),
+    base_delay=1.0,
+    max_delay=10.0,
+)
+
+
+def generation_stats() -> dict:
+    return {
+        "max_concurrency": GEMINI_MAX_CONCURRENCY,
+        "in_flight": _in_flight,
+        "queue_depth": _queue_depth,
+    }
+
+
+# Mode keluaran terstruktur untuk endpoint rekomendasi
+JSON_GENERATION_CONFIG = {"response_mime_type": "application/json"}
+
+
+async def _generate(kind: str, contents: str, generation_config: dict | None = None) -> str:
+    model = await PREFIXES[kind].get_model()
+    async with generation_slot():
+        with span(f"gemini.{kind}"):
+            response = await gemini_resilience.call(
+                lambda: model.generate_content_async(
+                    contents, generation_config=generation_config
+                )
+            )
+    record_token_usage(kind, getattr(response, "usage_metadata", None))
+    return response.text
 
-9. Laman medibot, chatbot medis untuk tanya jawab cepat seputar kehamilan dan berdasarkan analisis profil pengguna sehingga memberikan respons yang akurat.
 
-10. Pada bagian profile, pengguna dapat melihat dan mengubah profil data diri yang dimiliki, juga menambahkan koneksi. Dapat juga klik selesai kehamilan saat klik edit profile untuk menyelesaikan kehamilan. dan bisa keluar dari akun sekarang.
+def _chat_prompt(message: str, user_context: dict, history: str = "") -> str:
+    # Pertanyaan seputar aplikasi tidak membutuhkan data pengguna sama sekali
+    context_block = (
+        f"\nData pengguna:\n{compact_context(user_context, 'chat')}\n" if user_context else ""
+    )
+    history_block = f"\n{history}\n" if history else ""
+    return f"""{context_block}{history_block}
+Pertanyaan: {message}
 """
 
-genai.configure(api_key=GEMINI_API_KEY)
-
-model = genai.GenerativeModel(model_name="models/gemini-2.0-flash")
-
-
-def generate_response(message: str, user_context: dict) -> str:
-    system_context = f"""
-        Kau adalah Chat Bot yang bernama MediBot, sebuah chatbot yang akan melayani bidang kesehatan dan menjawab pertanyaan-pertanyaan seputar aplikasi ini dan kesehatan SAJA.
-        Jika ada pertanyaan  yang diluar bidang kesehatan atau aplikasi maka katakan bahwa kau tidak dapat menjawab pertanyaan itu.
-        JAWAB pertanyaan secara RINGKAS kecuali diminta untuk lebih detail atau diminta menjelaskan.
-        HANYA memperkenalkan diri JIKA pertanyaan mengandung kata HALO.
-        Deskripsi Aplikasi:
-        {app_desc}
-
-        Data pengguna:
-        {user_context}
 
-        Pertanyaan: {message}
-    """
-    response = model.generate_content(system_context)
-    return response.text
-
-
-def food_recommendation(
+async def generate_response(message: str, user_context: dict, history: str = "") -> str:
+    return await _generate("chat", _chat_prompt(message, user_context, history))
+
+
+async def generate_response_stream(message: str, user_context: dict, history: str = ""):
+    """Menghasilkan potongan teks jawaban MediBot segera setelah diterima dari Gemini."""
+    model = await PREFIXES["chat"].get_model()
+    prompt = _chat_prompt(message, user_context, history)
+    loop = asyncio.get_running_loop()
+    started = None
+
+    def open_stream():
+        nonlocal started
+        started = loop.time()
+        return model.generate_content_async(prompt, stream=True)
+
+    async with generation_slot():
+        with span("gemini.chat_stream"):
+            # Retry hanya sebelum potongan pertama diterima
+            response = await gemini_resilience.call(open_stream)
+            # GEMINI_TIMEOUT berlaku untuk seluruh stream, bukan hanya pembukaannya
+            deadline = started + GEMINI_TIMEOUT
+            chunks = aiter(response)
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(anext(chunks), deadline - loop.time())
+                except StopAsyncIteration:
+                    break
+                if chunk.parts:
+                    yield chunk.text
+    record_token_usage("chat", getattr(response, "usage_metadata", None))
+
+
+async def food_recommendation(
     user_food_rec_contenxt: dict,
 ) -> str:
-    system_context = f"""
-        Kau adalah Seorang ahli GIZI yang sangat handal dalam memberikan rekomendasi makanan untuk setiap orang terutama ibu hamil. Kamu selalu
-        memberi makanan sesuai dengan gizi yang diperlukan ibu hamil. Analisa juga menu makanan yang nyaman dimakan ketika breakfast, lunch, dan dinner. dalam 1 kali makan
-        biasanya terdiri dari makanan pokok seperti nasi disertai lauk pauk. PASTIKAN kembali gizi yang dikandung makanan sudah sesuai dengan kebutuhan gizi ibu hamil.
-        
-        DATA PENGGUNA DAN FOOD YANG TERSEDIA:
-        {user_food_rec_contenxt}
-        
-        gunakan user_food_track untuk menganalisis makanan yang telah dimakan hari ini
-        gunakan user_nutrition_summary untuk melihat nutrisi yang sudah dipenuhi
-        gunakan user_nutrition_need untuk melihat kebutuhan nutrisi ibu
-        gunakan database-food untuk melihat makanan yang tersedia di database
-        
-        PERINTAH
-        melalui data yang sudah diberikan sebelumnya analisa rekomendasi makanan untuk ibu hamil dengan format JSON
-        
-        FORMAT RESPON:
-        {{
-        "recommendations": {{
-            "breakfast": {{
-                "menu": [ {{"id" : 1 , "nama" : ... }}, {{"id" : 2 , "nama" : ... }}, ... ],
-                "alasan": "alasan mengapa menu ini cocok untuk sarapan ibu hamil"
-            }},
-            "lunch": {{
-                "menu": [ {{"id" : 1 , "nama" : ... }}, {{"id" : 2 , "nama" : ... }}, ... ],
-                "alasan": "alasan mengapa menu ini cocok untuk makan siang ibu hamil"
-            }},
-            "dinner": {{
-                "menu": [ {{"id" : 1 , "nama" : ... }}, {{"id" : 2 , "nama" : ... }}, ... ],
-                "alasan": "alasan mengapa menu ini cocok untuk makan malam ibu hamil"
-            }}
-        }},
-        "summary": {{
-            "nutrisi_kurang": ["zat besi", "kalsium", "asam folat"],
-            "nutrisi_terpenuhi": ["karbohidrat", "protein"],
-            "catatan": "catatan tambahan tentang status nutrisi pengguna hari ini"
-        }}
-        }}
-
-        ATURAN:
-        - Prioritaskan makanan dengan kandungan zat besi, asam folat, kalsium, vitamin D, protein, dan serat.
-        - Hindari makanan tinggi gula dan lemak jenuh.
-        - Sesuaikan rekomendasi dengan makanan yang tersedia di database.
-        - Hindari makanan yang sudah dimakan hari ini jika nilai gizinya sudah berlebihan.
-        - Gunakan menu yang sesuai selera dan kebiasaan lokal jika memungkinkan (contoh: nasi + tempe + sayur bening).
-        - Sertakan lauk hewani dan nabati seimbang.
-        - Perhatikan kenyamanan konsumsi (misal makanan ringan dan tidak berat untuk sarapan).
-        -  JANGAN CANTUMKAN ID PADA ALASAN
-        - PASTIKAN REKOMENDASI MAKANAN MEMPERHATIKAN ALERGI DAN KONDISI IBU HAMIL SESUAI PROFIL
-        OUTPUT harus valid JSON tanpa komentar atau teks tambahan.
-        - BUAT MAKANAN PADA "menu" berisi objek makanan sesuai dengan database food
-        - Berikan alasan dengan gaya bicara seperti perbincangan umum
-        """
-
-    response = model.generate_content(system_context)
-    return response.text
+    # Katalog lengkap diganti kandidat yang sudah diperingkat terhadap kekurangan nutrisi
+    candidate_table = format_candidate_table(select_candidates(user_food_rec_contenxt))
 
+    prompt = f"""
+DATA PENGGUNA:
+{compact_context(user_food_rec_contenxt, "food")}
 
-def activity_recommendation(
-    user_actv_rec_context: dict,
-) -> str:
+KANDIDAT MAKANAN (database-food, diurutkan dari yang paling menutupi kekurangan nutrisi):
+{candidate_table}
+"""
+    if FOOD_PROMPT_SEED:
+        plan = local_food_recommendation(user_food_rec_contenxt)["recommendations"]
+        seed = "\n".join(
+            f"{meal}: " + ", ".join(f"{item['id']} {item['nama']}" for item in plan[meal]["menu"])
+            for meal in plan
+        )
+        prompt += f"""
+USULAN AWAL (hitungan lokal, boleh disesuaikan):
+{seed}
+"""
+    return await _generate("food", prompt, JSON_GENERATION_CONFIG)
 
-    system_context = f"""
-    Kau adalah Seorang ahli KEBUGARAN dan KESEHATAN IBU HAMIL yang sangat berpengalaman dalam memberikan rekomendasi aktivitas fisik yang aman dan bermanfaat untuk ibu hamil pada setiap trimester kehamilan. Kamu selalu mempertimbangkan kondisi kesehatan, usia kehamilan, tingkat kebugaran, dan faktor risiko individual.
-
-    DATA PENGGUNA DAN KONTEKS AKTIVITAS:
-    {user_actv_rec_context}
-
-    gunakan user_profile untuk melihat usia, trimester kehamilan, dan kondisi kesehatan umum serta kondisi lain ibu hamil
-
-    PERINTAH:
-    Berdasarkan data yang diberikan, analisa dan berikan rekomendasi aktivitas fisik yang aman untuk ibu hamil dengan format JSON yang terstruktur. Sertakan rekomendasi khusus untuk HARI INI berdasarkan kondisi dan waktu saat ini.
-
-    FORMAT RESPON:
-    {{
-        "today_recommendation": {{
-            "date": "tanggal hari ini",
-            "day_of_week": "hari dalam seminggu",
-            "recommended_activities": [
-                {{
-                    "time_slot": "pagi/siang/sore/malam",
-                    "activity": {{
-                        "name": "nama aktivitas untuk hari ini",
-                        "duration": "durasi dalam menit",
-                        "intensity": "rendah/sedang/tinggi",
-                        "step_by_step": [
-                            "langkah 1: persiapan",
-                            "langkah 2: pemanasan",
-                            "langkah 3: aktivitas inti",
-                            "langkah 4: pendinginan"
-                        ],
-                        "equipment_needed": ["peralatan yang dibutuhkan"],
-                        "location": "tempat yang disarankan"
-                    }},
-                    "why_today": "alasan mengapa aktivitas ini cocok untuk hari ini"
-                }}
-            ],
-            "daily_goals": {{
-                "movement_target": "target gerakan untuk hari ini",
-                "hydration_reminder": "pengingat hidrasi",
-                "rest_periods": "kapan waktu istirahat yang disarankan"
-            }},
-            "weather_consideration": "pertimbangan cuaca untuk aktivitas hari ini",
-            "energy_level_tips": "tips mengelola energi berdasarkan trimester"
-        }},
-        "recommendations": {{
-            "morning_activities": {{
-                "activities": [
-                    {{
-                        "name": "nama aktivitas",
-                        "duration": "durasi dalam menit",
-                        "intensity": "rendah/sedang/tinggi",
-                        "benefits": ["manfaat 1", "manfaat 2", "manfaat 3"],
-                        "instructions": "cara melakukan aktivitas dengan aman"
-                    }}
-                ],
-                "best_time": "waktu terbaik untuk melakukan aktivitas pagi",
-                "precautions": ["peringatan 1", "peringatan 2"]
-            }},
-            "afternoon_activities": {{
-                "activities": [
-                    {{
-                        "name": "nama aktivitas",
-                        "duration": "durasi dalam menit", 
-                        "intensity": "rendah/sedang/tinggi",
-                        "benefits": ["manfaat 1", "manfaat 2", "manfaat 3"],
-                        "instructions": "cara melakukan aktivitas dengan aman"
-                    }}
-                ],
-                "best_time": "waktu terbaik untuk aktivitas siang",
-                "precautions": ["peringatan 1", "peringatan 2"]
-            }},
-            "evening_activities": {{
-                "activities": [
-                    {{
-                        "name": "nama aktivitas",
-                        "duration": "durasi dalam menit",
-                        "intensity": "rendah/sedang/tinggi", 
-                        "benefits": ["manfaat 1", "manfaat 2", "manfaat 3"],
-                        "instructions": "cara melakukan aktivitas dengan aman"
-                    }}
-                ],
-                "best_time": "waktu terbaik untuk aktivitas malam",
-                "precautions": ["peringatan 1", "peringatan 2"]
-            }}
-        }},
-        "weekly_schedule": {{
-            "monday": ["aktivitas pagi", "aktivitas sore"],
-            "tuesday": ["aktivitas pagi", "aktivitas malam"],
-            "wednesday": ["aktivitas pagi", "aktivitas siang"],
-            "thursday": ["aktivitas sore", "aktivitas malam"],
-            "friday": ["aktivitas pagi", "aktivitas siang"],
-            "saturday": ["aktivitas santai", "aktivitas keluarga"],
-            "sunday": ["aktivitas ringan", "istirahat"]
-        }},
-        "trimester_specific": {{
-            "current_trimester": "trimester saat ini",
-            "safe_activities": ["aktivitas aman untuk trimester ini"],
-            "avoid_activities": ["aktivitas yang harus dihindari"],
-            "modifications": "modifikasi khusus berdasarkan trimester"
-        }},
-        "health_considerations": {{
-            "safe_for_user": true,
-            "special_conditions": ["kondisi khusus yang perlu diperhatikan"],
-            "warning_signs": ["tanda bahaya saat berolahraga"],
-            "when_to_stop": ["kapan harus menghentikan aktivitas"]
-        }},
-        "summary": {{
-            "total_weekly_duration": "total durasi aktivitas per minggu",
-            "fitness_goals": ["tujuan kebugaran yang realistis"],
-            "progress_tracking": "cara memantau perkembangan",
-            "notes": "catatan tambahan dan motivasi"
-        }}
-    }}
-
-    ATURAN KEAMANAN:
-    - Prioritaskan aktivitas dengan intensitas rendah hingga sedang
-    - Hindari aktivitas dengan risiko jatuh, benturan, atau trauma perut
-    - Sesuaikan intensitas dengan trimester kehamilan (trimester 1: hati-hati mual, trimester 2: paling aman, trimester 3: hindari berbaring telentang)
-    - Selalu sertakan pemanasan dan pendinginan
-    - Pertimbangkan perubahan pusat gravitasi dan keseimbangan
-    - Hindari aktivitas dalam cuaca panas berlebihan
-    - Tidak boleh menahan napas atau aktivitas dengan tekanan tinggi
-    - Stop jika ada nyeri, pusing, sesak napas berlebihan, atau perdarahan
-
-    AKTIVITAS YANG DIREKOMENDASIKAN:
-    - Jalan santai, berenang, yoga prenatal, pilates ringan
-    - Latihan kegel, stretching, latihan pernapasan
-    - Senam hamil, aqua aerobik, bersepeda statis
-    - Latihan kekuatan ringan dengan beban tubuh
-
-    AKTIVITAS YANG HARUS DIHINDARI:
-    - Olahraga kontak, olahraga ekstrem, diving
-    - Aktivitas dengan risiko jatuh tinggi
-    - Hot yoga, sauna berlebihan
-    - Sit-up atau crunch setelah trimester pertama
-
-    KHUSUS UNTUK REKOMENDASI HARI INI:
-    - Berikan aktivitas yang praktis dan mudah dilakukan
-    - Pertimbangkan waktu saat ini (pagi/siang/sore/malam)
-    - Sertakan panduan step-by-step yang detail
-    - Berikan alternatif jika cuaca tidak mendukung
-    - Sesuaikan dengan energi yang biasanya dimiliki ibu hamil pada waktu tersebut
-    - Berikan motivasi dan encouragement untuk memulai hari ini
-
-    OUTPUT harus valid JSON tanpa komentar atau teks tambahan.
-    """
 
-    response = model.generate_content(system_context)
-    return response.text
+async def activity_recommendation(
+    user_actv_rec_context: dict,
+) -> str:
+    prompt = f"""
+DATA PENGGUNA DAN KONTEKS AKTIVITAS:
+{compact_context(user_actv_rec_context, "activity")}
+"""
+    return await _generate("activity", prompt, JSON_GENERATION_CONFIG)
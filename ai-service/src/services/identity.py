@@ -0,0 +1,141 @@
+# src/services/identity.py
+import base64
+import hashlib
+import hmac
+import json
+import time
+from config import IDENTITY_CACHE_TTL, IDENTITY_CACHE_MAX, JWT_SECRET, JWT_PUBLIC_KEY
+from services.kv_store import MemoryBackend
+from utils.auth import token_fingerprint
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def decode_jwt_claims(token: str) -> dict | None:
+    """Baca payload JWT tanpa verifikasi (hanya untuk membaca `exp`)."""
+    try:
+        return json.loads(_b64decode(token.split(".")[1]))
+    except (IndexError, ValueError):
+        return None
+
+
+def verify_jwt(token: str) -> dict | None:
+    """
+    Verifikasi JWT secara lokal dengan kunci yang sama dengan backend.
+
+    JWT_PUBLIC_KEY (RS256, membutuhkan paket `PyJWT`) atau JWT_SECRET (HS256)
+    harus dikonfigurasi. Mengembalikan claims jika token valid, selain itu None.
+    """
+    if JWT_PUBLIC_KEY:
+        try:
+            import jwt
+        except ImportError as e:
+            raise RuntimeError("JWT_PUBLIC_KEY membutuhkan paket `PyJWT`") from e
+
+        try:
+            return jwt.decode(token, JWT_PUBLIC_KEY, algorithms=["RS256"])
+        except jwt.PyJWTError:
+            return None
+
+    if not JWT_SECRET:
+        return None
+    try:
+        header_segment, payload_segment, signature_segment = token.split(".")
+        header = json.loads(_b64decode(header_segment))
+        signature = _b64decode(signature_segment)
+    except ValueError:
+        return None
+    if header.get("alg") != "HS256":
+        return None
+
+    expected = hmac.new(
+        JWT_SECRET.encode(),
+        f"{header_segment}.{payload_segment}".encode(),
+        hashlib.sha256,
+    ).digest()
+    if not hmac.compare_digest(signature, expected):
+        return None
+
+    claims = decode_jwt_claims(token)
+    now = time.time()
+    if claims is None or claims.get("exp", now + 1) <= now or claims.get("nbf", now) > now:
+        return None
+    return claims
+
+
+def mint_service_token(user_id: int, ttl: float) -> str:
+    """
+    Buat JWT HS256 berumur pendek atas nama pengguna (claims `userId` seperti
+    token backend) untuk job internal seperti precompute. Membutuhkan
+    JWT_SECRET yang sama dengan backend; token tidak pernah disimpan.
+    """
+    if not JWT_SECRET:
+        raise RuntimeError("Membuat token layanan membutuhkan JWT_SECRET")
+    now = int(time.time())
+    header = _b64encode(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    payload = _b64encode(
+        json.dumps({"userId": user_id, "iat": now, "exp": now + int(ttl)}).encode()
+    )
+    signature = hmac.new(
+        JWT_SECRET.encode(), f"{header}.{payload}".encode(), hashlib.sha256
+    ).digest()
+    return f"{header}.{payload}.{_b64encode(signature)}"
+
+
+class IdentityCache:
+    """
+    Cache hasil /api/auth/me per token.
+
+    Entri disimpan dengan key hash token selama `ttl` detik, tetapi tidak
+    melebihi waktu `exp` JWT. Jika kunci JWT dikonfigurasi, user_id dibaca
+    langsung dari token yang sudah diverifikasi tanpa request ke backend.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.backend = MemoryBackend(max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.local = 0
+
+    async def resolve(self, token: str | None, headers: dict, fetch_json) -> dict:
+        """Kembalikan envelope /api/auth/me ({"data": {"user": {...}}}) untuk token."""
+        if not token:
+            return await fetch_json("/api/auth/me", headers)
+
+        claims = verify_jwt(token)
+        if claims is not None and claims.get("userId") is not None:
+            self.local += 1
+            return {
+                "success": True,
+                "data": {"user": {"id": claims["userId"], "email": claims.get("email")}},
+            }
+
+        key = token_fingerprint(token)
+        cached = await self.backend.get(key)
+        if cached is not None:
+            self.hits += 1
+            return json.loads(cached)
+
+        self.misses += 1
+        user_data = await fetch_json("/api/auth/me", headers)
+
+        ttl = self.ttl
+        exp = (decode_jwt_claims(token) or {}).get("exp")
+        if isinstance(exp, (int, float)):
+            ttl = min(ttl, exp - time.time())
+        if ttl > 0:
+            await self.backend.set(key, json.dumps(user_data), ttl)
+        return user_data
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "local": self.local}
+
+
+identity_cache = IdentityCache(ttl=IDENTITY_CACHE_TTL, max_entries=IDENTITY_CACHE_MAX)
@@ -0,0 +1,196 @@
+# src/services/kv_store.py
+import asyncio
+import sqlite3
+import time
+from collections import OrderedDict
+from config import REDIS_URL, SQLITE_PATH
+from utils.resilience import TokenBucket
+
+
+class MemoryBackend:
+    """Penyimpanan LRU + TTL di memori proses (default)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    async def get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        self._entries[key] = (time.time() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+class SQLiteBackend:
+    """Penyimpanan SQLite lokal yang dapat dipakai bersama oleh beberapa worker."""
+
+    def __init__(self, path: str, max_entries: int, table: str):
+        self.path = path
+        self.max_entries = max_entries
+        self.table = table
+        with self._connect() as conn:
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _get(self, key: str) -> str | None:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT value FROM {self.table} WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?",
+                (now, key),
+            )
+            return row[0]
+
+    def _set(self, key: str, value: str, ttl: float) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl, now),
+            )
+            conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,))
+            conn.execute(
+                f"""
+                DELETE FROM {self.table} WHERE key IN (
+                    SELECT key FROM {self.table}
+                    ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+
+    def _delete(self, key: str) -> None:
+        with self._connect() as conn:
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    async def get(self, key: str) -> str | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+
+class SQLiteTokenBucket(TokenBucket):
+    """
+    Token bucket yang state-nya disimpan di SQLite sehingga batas laju
+    berlaku bersama untuk seluruh worker di mesin yang sama.
+    """
+
+    def __init__(self, path: str, key: str, rate: float, capacity: float, max_wait: float):
+        super().__init__(rate, capacity, max_wait)
+        self.path = path
+        self.key = key
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS rate_limits (
+                    key TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # Transaksi dibuka manual (BEGIN IMMEDIATE) agar baca-ubah-tulis tidak saling tumpang tindih
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _reserve_shared(self) -> float:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM rate_limits WHERE key = ?", (self.key,)
+            ).fetchone()
+            # Waktu dinding karena dibandingkan antar proses
+            now = time.time()
+            tokens = self.capacity
+            if row is not None:
+                tokens = min(self.capacity, row[0] + (now - row[1]) * self.rate)
+
+            wait = (1 - tokens) / self.rate
+            if wait <= self.max_wait:
+                tokens -= 1
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limits VALUES (?, ?, ?)", (self.key, tokens, now)
+            )
+            return wait
+
+    async def _reserve(self) -> float:
+        return await asyncio.to_thread(self._reserve_shared)
+
+
+class RedisBackend:
+    """Penyimpanan Redis (atau server yang kompatibel); membutuhkan paket `redis`."""
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("Backend redis membutuhkan paket `redis`") from e
+        self._client = redis.from_url(url, decode_responses=True)
+
+    async def get(self, key: str) -> str | None:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        await self._client.set(key, value, ex=max(int(ttl), 1))
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(key)
+
+
+def create_backend(name: str, table: str, max_entries: int):
+    """Buat penyimpanan key-value: "memory" (default), "sqlite", atau "redis"."""
+    if name == "sqlite":
+        return SQLiteBackend(SQLITE_PATH, max_entries, table)
+    if name == "redis":
+        return RedisBackend(REDIS_URL)
+    return MemoryBackend(max_entries)
+
+
+def create_rate_limiter(name: str, key: str, rate: float, capacity: float, max_wait: float):
+    """
+    Buat pembatas laju: "memory" (default, per worker) atau "sqlite" (bersama
+    untuk seluruh worker yang memakai SQLITE_PATH yang sama).
+    """
+    if name == "sqlite" and rate > 0:
+        return SQLiteTokenBucket(SQLITE_PATH, key, rate, capacity, max_wait)
+    return TokenBucket(rate, capacity, max_wait)
@@ -0,0 +1,118 @@
+# src/services/local_recommender.py
+import numpy as np
+from models.recommendation import FoodRecommendationResponse
+from services.food_candidates import (
+    KEY_NUTRIENTS,
+    MEALS,
+    unwrap,
+    food_matrix,
+    nutrient_deficit,
+    allergy_terms,
+    allowed_foods,
+)
+
+# Jumlah makanan per waktu makan pada rekomendasi lokal
+ITEMS_PER_MEAL = 3
+
+MEAL_LABELS = {"breakfast": "sarapan", "lunch": "makan siang", "dinner": "makan malam"}
+NUTRIENT_LABELS = {
+    "zat_besi": "zat besi",
+    "asam_folat": "asam folat",
+    "kalsium": "kalsium",
+    "vitamin_d": "vitamin D",
+    "protein": "protein",
+    "serat": "serat",
+}
+
+
+def plan_meals(
+    matrix: np.ndarray, needs: np.ndarray, deficit: np.ndarray, allowed: np.ndarray
+) -> dict[str, list[int]]:
+    """
+    Susun makanan per waktu makan secara greedy.
+
+    Sisa kebutuhan (dinormalisasi terhadap kebutuhan harian) dibagi rata ke
+    waktu makan yang tersisa. Untuk tiap waktu makan dipilih makanan yang
+    paling banyak menutupi target waktu makan tersebut, lalu target dikurangi
+    kontribusinya sebelum makanan berikutnya dipilih. Makanan yang sudah
+    dipilih atau mengandung alergen tidak dipilih lagi.
+    """
+    scale = np.where(needs > 0, needs, 1.0)
+    coverage = matrix / scale
+    remaining = deficit / scale
+    available = allowed.copy()
+
+    plan = {}
+    for index, meal in enumerate(MEALS):
+        target = remaining / (len(MEALS) - index)
+        chosen = []
+        for _ in range(ITEMS_PER_MEAL):
+            if not available.any():
+                break
+            if target.any():
+                scores = np.minimum(coverage, target).sum(axis=1)
+            else:
+                # Kebutuhan sudah terpenuhi: pilih berdasarkan kepadatan nutrisi saja
+                scores = coverage.sum(axis=1)
+            scores = np.where(available, scores, -np.inf)
+            best = int(np.argmax(scores))
+            chosen.append(best)
+            available[best] = False
+            target = target - np.minimum(coverage[best], target)
+            remaining = np.maximum(remaining - coverage[best], 0)
+        plan[meal] = chosen
+    return plan
+
+
+def _reason(meal: str, covered: list[str]) -> str:
+    if not covered:
+        return f"Menu {MEAL_LABELS[meal]} dengan kandungan gizi seimbang dari database makanan."
+    return (
+        f"Dipilih untuk {MEAL_LABELS[meal]} karena membantu menutupi kekurangan "
+        f"{', '.join(covered)} hari ini."
+    )
+
+
+def local_food_recommendation(context: dict) -> dict:
+    """
+    Rekomendasi makanan yang dihitung lokal dari database-food tanpa Gemini,
+    dengan schema yang sama seperti FoodRecommendationResponse. Dipakai
+    sebagai cadangan ketika Gemini gagal atau kelebihan beban.
+    """
+    foods = unwrap(context.get("database-food")) or []
+    needs, deficit = nutrient_deficit(
+        unwrap(context.get("user_nutrition_need")),
+        unwrap(context.get("user_nutrition_summary")),
+    )
+    labels = [NUTRIENT_LABELS[nutrient[3]] for nutrient in KEY_NUTRIENTS]
+    lacking = [label for label, gap in zip(labels, deficit) if gap > 0]
+
+    recommendations = {}
+    if foods:
+        matrix, ids, names = food_matrix(foods)
+        allowed = allowed_foods(foods, allergy_terms(unwrap(context.get("user_profile"))))
+        for meal, chosen in plan_meals(matrix, needs, deficit, allowed).items():
+            covered = [
+                label
+                for label, gap, amount in zip(labels, deficit, matrix[chosen].sum(axis=0))
+                if gap > 0 and amount > 0
+            ]
+            recommendations[meal] = {
+                "menu": [{"id": ids[i], "nama": names[i]} for i in chosen],
+                "alasan": _reason(meal, covered),
+            }
+    else:
+        recommendations = {meal: {"menu": [], "alasan": ""} for meal in MEALS}
+
+    result = {
+        "recommendations": recommendations,
+        "summary": {
+            "nutrisi_kurang": lacking,
+            "nutrisi_terpenuhi": [label for label in labels if label not in lacking],
+            "catatan": (
+                "Rekomendasi dihitung otomatis dari sisa kebutuhan gizi hari ini dan "
+                "database makanan, dengan menghindari alergi yang tercatat di profil."
+            ),
+        },
+    }
+    return FoodRecommendationResponse.model_validate(result).model_dump()
@@ -0,0 +1,146 @@
+# src/services/precompute.py
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from datetime import datetime, timedelta
+import httpx
+from google.api_core import exceptions as google_exceptions
+from services.identity import mint_service_token
+from services.recommender import RECOMMENDERS, get_recommendation
+from utils.resilience import OverloadedError
+
+logger = logging.getLogger(__name__)
+
+# Jeda dasar (detik) sebelum mencoba ulang setelah terkena rate limit
+RETRY_BASE_DELAY = 5.0
+
+
+def seconds_until_midnight() -> float:
+    now = datetime.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return (midnight - now).total_seconds()
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """Cek apakah error (atau penyebabnya) berasal dari rate limit Gemini atau backend."""
+    while error is not None:
+        if isinstance(error, (google_exceptions.ResourceExhausted, OverloadedError)):
+            return True
+        if isinstance(error, httpx.HTTPStatusError) and error.response.status_code == 429:
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class PrecomputeProgress:
+    """
+    Daftar item yang sudah selesai hari ini, disimpan ke file JSON setelah
+    setiap item sehingga job yang terhenti dapat dilanjutkan. Progres dari
+    tanggal lain diabaikan.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.date = datetime.today().strftime("%Y-%m-%d")
+        self.done: set[str] = set()
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if data.get("date") == self.date:
+                self.done = set(data.get("done", []))
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    def mark_done(self, item: str) -> None:
+        self.done.add(item)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"date": self.date, "done": sorted(self.done)}, f)
+        os.replace(tmp_path, self.path)
+
+
+class PrecomputeJob:
+    """
+    Membuat rekomendasi harian untuk daftar user id di luar jalur interaktif.
+
+    Setiap pengguna diproses dengan token layanan berumur `token_ttl` detik
+    yang dibuat tepat sebelum dipakai (lihat mint_service_token), sehingga
+    tidak ada token pengguna yang perlu dikumpulkan atau disimpan.
+
+    Hasil disimpan ke cache rekomendasi dengan fingerprint konteks yang sama
+    dengan endpoint, sehingga endpoint langsung melayani dari cache selama data
+    pengguna tidak berubah. Paling banyak `concurrency` pengguna diproses
+    bersamaan dan pengguna baru dimulai paling banyak `rate_per_minute` kali
+    per menit agar beban tersebar merata. Item yang terkena rate limit dicoba
+    ulang dengan jeda eksponensial, dan seluruh job ikut menunda pengguna baru.
+    """
+
+    def __init__(
+        self,
+        progress: PrecomputeProgress,
+        kinds: list[str],
+        concurrency: int,
+        rate_per_minute: float,
+        max_retries: int,
+        token_ttl: float,
+    ):
+        self.progress = progress
+        self.token_ttl = token_ttl
+        self.kinds = kinds
+        self.max_retries = max_retries
+        self.interval = 60 / rate_per_minute if rate_per_minute > 0 else 0.0
+        self._slots = asyncio.Semaphore(concurrency)
+        self._pace_lock = asyncio.Lock()
+        self._next_start = 0.0
+        self.stats = {"generated": 0, "skipped": 0, "failed": 0}
+
+    async def _pace(self) -> None:
+        async with self._pace_lock:
+            delay = self._next_start - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_start = max(self._next_start, time.monotonic()) + self.interval
+
+    def _pause(self, delay: float) -> None:
+        self._next_start = max(self._next_start, time.monotonic() + delay)
+
+    async def _precompute(self, kind: str, token: str, item: str) -> None:
+        fetch_context = RECOMMENDERS[kind][0]
+        for attempt in range(self.max_retries + 1):
+            try:
+                context = await fetch_context(token)
+                await get_recommendation(
+                    kind, context, cache_ttl=seconds_until_midnight(), allow_fallback=False
+                )
+                self.progress.mark_done(item)
+                self.stats["generated"] += 1
+                return
+            except Exception as e:
+                if not is_rate_limited(e) or attempt == self.max_retries:
+                    logger.warning("Precompute %s gagal: %s", item, e)
+                    self.stats["failed"] += 1
+                    return
+                delay = RETRY_BASE_DELAY * 2**attempt * random.uniform(1, 1.5)
+                logger.info("Rate limit pada %s, mencoba lagi dalam %.1f detik", item, delay)
+                self._pause(delay)
+                await asyncio.sleep(delay)
+
+    async def _run_user(self, user_id: int) -> None:
+        items = [(kind, f"{kind}:{user_id}") for kind in self.kinds]
+        pending = [(kind, item) for kind, item in items if item not in self.progress.done]
+        self.stats["skipped"] += len(items) - len(pending)
+        if not pending:
+            return
+
+        async with self._slots:
+            await self._pace()
+            token = mint_service_token(user_id, self.token_ttl)
+            for kind, item in pending:
+                await self._precompute(kind, token, item)
+
+    async def run(self, user_ids: list[int]) -> dict:
+        await asyncio.gather(*(self._run_user(user_id) for user_id in user_ids))
+        return self.stats
@@ -0,0 +1,94 @@
+# src/services/recommendation_cache.py
+import hashlib
+import json
+from datetime import datetime
+from config import (
+    RECOMMENDATION_CACHE_BACKEND,
+    RECOMMENDATION_CACHE_TTL,
+    RECOMMENDATION_CACHE_MAX_ENTRIES,
+    RECOMMENDATION_STALE_TTL,
+)
+from services.kv_store import create_backend
+from services.user_data import CATALOG_KEYS, catalog_cache
+
+
+class RecommendationCache:
+    """
+    Cache hasil rekomendasi yang dikunci oleh fingerprint konteks pengguna.
+
+    Kunci terdiri dari jenis rekomendasi, user_id, tanggal, dan hash dari
+    konteks yang dinormalisasi, sehingga rekomendasi baru hanya dibuat ketika
+    data pengguna (makanan, aktivitas, profil) atau katalog berubah.
+
+    Rekomendasi terakhir tiap pengguna juga disimpan terpisah selama
+    `stale_ttl` detik sebagai cadangan ketika rekomendasi baru gagal dibuat.
+    """
+
+    def __init__(self, backend, ttl: float, stale_ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    @staticmethod
+    def fingerprint(kind: str, context: dict) -> str:
+        normalized = {}
+        for key, value in context.items():
+            if key in CATALOG_KEYS:
+                # Katalog diwakili versinya agar tidak perlu meng-hash seluruh isinya
+                version = catalog_cache.version(CATALOG_KEYS[key])
+                value = version if version is not None else value
+            normalized[key] = value
+
+        digest = hashlib.sha256(
+            json.dumps(
+                normalized, sort_keys=True, separators=(",", ":"), default=str
+            ).encode()
+        ).hexdigest()
+        today = datetime.today().strftime("%Y-%m-%d")
+        return f"rec:{kind}:{context.get('user_id')}:{today}:{digest}"
+
+    @staticmethod
+    def latest_key(kind: str, user_id) -> str:
+        return f"rec:{kind}:{user_id}:latest"
+
+    async def get(self, kind: str, context: dict) -> dict | None:
+        value = await self.backend.get(self.fingerprint(kind, context))
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+
+    async def set(
+        self, kind: str, context: dict, result: dict, ttl: float | None = None
+    ) -> None:
+        value = json.dumps(result, ensure_ascii=False)
+        await self.backend.set(
+            self.fingerprint(kind, context), value, self.ttl if ttl is None else ttl
+        )
+        await self.backend.set(
+            self.latest_key(kind, context.get("user_id")), value, self.stale_ttl
+        )
+
+    async def get_stale(self, kind: str, user_id) -> dict | None:
+        """Rekomendasi terakhir pengguna, meskipun konteksnya sudah berubah."""
+        value = await self.backend.get(self.latest_key(kind, user_id))
+        if value is None:
+            return None
+        self.stale += 1
+        return json.loads(value)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "stale": self.stale}
+
+
+recommendation_cache = RecommendationCache(
+    create_backend(
+        RECOMMENDATION_CACHE_BACKEND, "recommendation_cache", RECOMMENDATION_CACHE_MAX_ENTRIES
+    ),
+    RECOMMENDATION_CACHE_TTL,
+    RECOMMENDATION_STALE_TTL,
+)
@@ -0,0 +1,149 @@
+# src/services/recommender.py
+import json
+import logging
+from typing import Any, Dict
+from pydantic import BaseModel, ValidationError
+from config import (
+    RECOMMENDATION_MAX_ATTEMPTS,
+    RECOMMENDATION_COALESCE_WINDOW,
+    RECOMMENDATION_LOCAL_FALLBACK,
+)
+from models.recommendation import (
+    FoodRecommendationResponse,
+    ActivityRecommendationResponse,
+)
+from services.user_data import fetch_user_food_rec_context, fetch_user_actv_rec_context
+from services.gemini_service import food_recommendation, activity_recommendation
+from services.recommendation_cache import recommendation_cache
+from services.local_recommender import local_food_recommendation
+from utils.auth import token_fingerprint
+from utils.json_repair import parse_model_json
+from utils.singleflight import SingleFlight
+from utils.metrics import span
+
+logger = logging.getLogger(__name__)
+
+# Pengambil konteks, fungsi generate, dan schema respons untuk tiap jenis rekomendasi
+RECOMMENDERS = {
+    "food": (
+        fetch_user_food_rec_context,
+        food_recommendation,
+        FoodRecommendationResponse,
+    ),
+    "activity": (
+        fetch_user_actv_rec_context,
+        activity_recommendation,
+        ActivityRecommendationResponse,
+    ),
+}
+
+# Rekomendasi yang dihitung lokal tanpa model, dipakai jika generate gagal
+LOCAL_FALLBACKS = {
+    "food": local_food_recommendation,
+}
+
+# Request rekomendasi beruntun dari pengguna yang sama berbagi satu eksekusi
+recommendation_flight = SingleFlight(window=RECOMMENDATION_COALESCE_WINDOW)
+
+
+async def recommend(kind: str, token: str) -> Dict[Any, Any]:
+    """
+    Ambil konteks pengguna lalu rekomendasinya. Request bersamaan untuk
+    pengguna dan jenis rekomendasi yang sama digabung menjadi satu eksekusi.
+    """
+    fetch_context = RECOMMENDERS[kind][0]
+
+    async def run():
+        context = await fetch_context(token)
+        return await get_recommendation(kind, context)
+
+    return await recommendation_flight.do(f"{kind}:{token_fingerprint(token)}", run)
+
+
+async def get_recommendation(
+    kind: str, context: dict, cache_ttl: float | None = None, allow_fallback: bool = True
+) -> Dict[Any, Any]:
+    """
+    Ambil rekomendasi dari cache, atau generate lewat model jika konteks berubah.
+
+    Respons model yang tidak valid diperbaiki secara lokal terlebih dahulu;
+    generate ulang hanya dilakukan jika perbaikan gagal, maksimal
+    RECOMMENDATION_MAX_ATTEMPTS kali. `cache_ttl` menimpa umur entri cache
+    default (misal untuk hasil precompute yang berlaku sampai akhir hari).
+
+    Jika generate gagal (misal Gemini kelebihan beban atau circuit breaker
+    terbuka) dan `allow_fallback` aktif, rekomendasi terakhir pengguna dipakai,
+    atau jika belum ada, rekomendasi lokal (LOCAL_FALLBACKS). Hasil cadangan
+    tidak disimpan ke cache agar request berikutnya mencoba model lagi.
+    """
+    # Gunakan hasil sebelumnya jika konteks pengguna tidak berubah
+    cached_data = await recommendation_cache.get(kind, context)
+    if cached_data is not None:
+        return cached_data
+
+    try:
+        cleaned_data = await _generate_validated(kind, context)
+    except Exception as e:
+        if not allow_fallback:
+            raise
+        fallback = await _fallback(kind, context)
+        if fallback is None:
+            raise
+        logger.warning("Memakai rekomendasi %s cadangan karena generate gagal: %s", kind, e)
+        return fallback
+
+    await recommendation_cache.set(kind, context, cleaned_data, ttl=cache_ttl)
+    return cleaned_data
+
+
+async def _fallback(kind: str, context: dict) -> Dict[Any, Any] | None:
+    stale = await recommendation_cache.get_stale(kind, context.get("user_id"))
+    if stale is not None:
+        return stale
+    local = LOCAL_FALLBACKS.get(kind)
+    if local is None or not RECOMMENDATION_LOCAL_FALLBACK:
+        return None
+    with span(f"local.{kind}"):
+        return local(context)
+
+
+async def _generate_validated(kind: str, context: dict) -> Dict[Any, Any]:
+    _, generate, response_model = RECOMMENDERS[kind]
+    for attempt in range(1, RECOMMENDATION_MAX_ATTEMPTS + 1):
+        recommendation_response = await generate(context)
+        try:
+            with span(f"parse.{kind}"):
+                cleaned_data = clean_model_response(recommendation_response, response_model)
+            break
+        except (json.JSONDecodeError, ValidationError) as e:
+            logger.warning(
+                "Respons %s tidak valid (percobaan %d/%d): %s",
+                kind,
+                attempt,
+                RECOMMENDATION_MAX_ATTEMPTS,
+                e,
+            )
+            if attempt == RECOMMENDATION_MAX_ATTEMPTS:
+                raise
+    return cleaned_data
+
+
+def clean_model_response(
+    response: str, response_model: type[BaseModel]
+) -> Dict[Any, Any]:
+    """
+    Parse response dari model AI dan validasi terhadap schema respons.
+
+    Args:
+        response: Raw response string dari model AI
+        response_model: Schema Pydantic untuk jenis rekomendasi
+
+    Returns:
+        Dict: Parsed JSON response yang sudah divalidasi
+
+    Raises:
+        json.JSONDecodeError: Jika response bukan JSON yang valid setelah diperbaiki
+        ValidationError: Jika struktur JSON tidak sesuai schema
+    """
+    data = parse_model_json(response)
+    return response_model.model_validate(data).model_dump()
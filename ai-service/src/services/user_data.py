@@ -1,112 +1,293 @@
 # src/services/user_data.py
-import requests
+import asyncio
+import hashlib
+import logging
+import time
+import httpx
 from datetime import datetime
 from fastapi import HTTPException
-from config import BACKEND_URL
+from config import (
+    BACKEND_URL,
+    BACKEND_TIMEOUT,
+    BACKEND_MAX_CONNECTIONS,
+    BACKEND_WARM_CONNECTIONS,
+    BACKEND_RETRIES,
+    BACKEND_BREAKER_THRESHOLD,
+    BACKEND_BREAKER_RESET,
+    CATALOG_TTL,
+)
+from services.activity_history import activity_history
+from services.identity import identity_cache
+from utils.metrics import timed
+from utils.resilience import Resilient, CircuitBreaker, ResilienceError
 
+logger = logging.getLogger(__name__)
 
-def fetch_user_data(token: str) -> dict:
-    headers = {"Authorization": f"Bearer {token}"} if token else {}
-    today = datetime.today().strftime("%Y-%m-%d")
+# Status backend yang dianggap sementara dan boleh dicoba ulang
+RETRYABLE_STATUS = {429, 502, 503, 504}
 
-    try:
-        user_data = requests.get(f"{BACKEND_URL}/api/auth/me", headers=headers).json()
-        user_id = user_data["data"]["user"]["id"]
 
-        def get(endpoint):
-            res = requests.get(endpoint, headers=headers)
-            res.raise_for_status()
-            return res.json()
-
-        return {
-            "user_id": user_id,
-            "user_data": user_data,
-            "user_profile": get(f"{BACKEND_URL}/api/users/{user_id}/profile"),
-            "user_food_track": get(
-                f"{BACKEND_URL}/api/users/{user_id}/nutrition/meals?date={today}"
-            ),
-            "user_activity_track": get(
-                f"{BACKEND_URL}/api/users/{user_id}/activities/history?startDate=1945-08-17&endDate=2045-08-17"
-            ),
-            "user_activity_today": get(
-                f"{BACKEND_URL}/api/users/{user_id}/activities/today"
-            ),
-            "user_nutrition_summary": get(
-                f"{BACKEND_URL}/api/users/{user_id}/nutrition/summary?date={today}"
-            ),
-            "user_nutrition_need": get(
-                f"{BACKEND_URL}/api/users/{user_id}/nutrition/needs"
+def is_retryable_backend_error(error: BaseException) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS
+    return isinstance(error, httpx.TransportError)
+
+
+backend_resilience = Resilient(
+    "backend",
+    timeout=BACKEND_TIMEOUT,
+    retries=BACKEND_RETRIES,
+    retryable=is_retryable_backend_error,
+    breaker=CircuitBreaker(BACKEND_BREAKER_THRESHOLD, BACKEND_BREAKER_RESET),
+)
+
+
+async def _activity_history_summary(user_id: int, headers: dict) -> dict:
+    return await activity_history.summary(user_id, headers, _get)
+
+
+def _optional(path: str):
+    """
+    Endpoint pelengkap yang boleh tidak ada: 404 dari backend dibaca sebagai
+    data kosong (None) alih-alih menggagalkan seluruh konteks.
+    """
+
+    async def fetch(user_id: int, headers: dict) -> dict | None:
+        try:
+            return await _get(path.format(user_id=user_id), headers)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                return None
+            raise
+
+    return fetch
+
+
+# Endpoint yang bergantung pada user_id, diambil paralel setelah /api/auth/me.
+# Nilai callable dipanggil dengan (user_id, headers) alih-alih di-GET langsung.
+USER_DATA_ENDPOINTS = {
+    "user_profile": "/api/users/{user_id}/profile",
+    "user_food_track": "/api/users/{user_id}/nutrition/meals?date={today}",
+    "user_activity_track": _activity_history_summary,
+    "user_activity_today": "/api/users/{user_id}/activities/today",
+    "user_nutrition_summary": "/api/users/{user_id}/nutrition/summary?date={today}",
+    "user_nutrition_need": "/api/users/{user_id}/nutrition/needs",
+}
+
+FOOD_REC_ENDPOINTS = {
+    "user_profile": "/api/users/{user_id}/profile",
+    "user_food_track": "/api/users/{user_id}/nutrition/meals?date={today}",
+    "user_nutrition_summary": "/api/users/{user_id}/nutrition/summary?date={today}",
+    "user_nutrition_need": "/api/users/{user_id}/nutrition/needs",
+    "database-food": "/api/nutrition/food",
+}
+
+ACTV_REC_ENDPOINTS = {
+    "user_profile": "/api/users/{user_id}/profile",
+    "user_food_track": "/api/users/{user_id}/nutrition/meals?date={today}",
+    "user_activity_today": "/api/users/{user_id}/activities/today",
+    "user_activity_history": _activity_history_summary,
+    # Sumber trimester kehamilan (trimesterNumber); 404 berarti tidak ada kehamilan aktif
+    "user_nutrition_need": _optional("/api/users/{user_id}/nutrition/needs"),
+    "database-activity": "/api/activities",
+}
+
+# Katalog referensi yang sama untuk semua pengguna, dilayani dari catalog_cache
+CATALOG_KEYS = {
+    "database-food": "/api/nutrition/food",
+    "database-activity": "/api/activities",
+}
+CATALOG_PATHS = set(CATALOG_KEYS.values())
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Client HTTP bersama (connection pool) untuk seluruh request ke backend."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            base_url=BACKEND_URL,
+            timeout=httpx.Timeout(BACKEND_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=BACKEND_MAX_CONNECTIONS,
+                max_keepalive_connections=BACKEND_MAX_CONNECTIONS,
             ),
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=502, detail=f"Gagal mengambil data user dari backend: {str(e)}"
         )
+    return _client
 
 
-def fetch_user_food_rec_context(token: str) -> dict:
-    headers = {"Authorization": f"Bearer {token}"} if token else {}
-    today = datetime.today().strftime("%Y-%m-%d")
+async def warm_http_client() -> None:
+    """
+    Buka beberapa koneksi keep-alive ke backend saat startup agar request
+    pertama tidak menanggung DNS/TCP/TLS handshake. Status respons tidak
+    diperiksa dan kegagalan tidak menghentikan startup.
+    """
+    client = get_http_client()
 
-    try:
-        user_data = requests.get(f"{BACKEND_URL}/api/auth/me", headers=headers).json()
-        user_id = user_data["data"]["user"]["id"]
+    async def touch():
+        try:
+            await client.head("/")
+        except httpx.HTTPError as e:
+            return e
+
+    results = await asyncio.gather(*(touch() for _ in range(BACKEND_WARM_CONNECTIONS)))
+    errors = [e for e in results if e is not None]
+    if errors:
+        logger.warning("Pemanasan koneksi backend gagal: %s", errors[0])
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
-        def get(endpoint):
-            res = requests.get(endpoint, headers=headers)
+
+async def _request(path: str, headers: dict) -> httpx.Response:
+    """GET ke backend dengan batas waktu, retry, dan circuit breaker; 304 tidak dianggap error."""
+
+    async def attempt():
+        res = await get_http_client().get(path, headers=headers)
+        if res.status_code != 304:
             res.raise_for_status()
-            return res.json()
-
-        return {
-            "user_id": user_id,
-            "user_data": user_data,
-            "user_profile": get(f"{BACKEND_URL}/api/users/{user_id}/profile"),
-            "user_food_track": get(
-                f"{BACKEND_URL}/api/users/{user_id}/nutrition/meals?date={today}"
-            ),
-            "user_nutrition_summary": get(
-                f"{BACKEND_URL}/api/users/{user_id}/nutrition/summary?date={today}"
-            ),
-            "user_nutrition_need": get(
-                f"{BACKEND_URL}/api/users/{user_id}/nutrition/needs"
-            ),
-            "database-food": get(f"{BACKEND_URL}/api/nutrition/food"),
+        return res
+
+    return await backend_resilience.call(attempt)
+
+
+async def _get(path: str, headers: dict) -> dict:
+    res = await _request(path, headers)
+    return res.json()
+
+
+class CatalogCache:
+    """
+    Cache katalog referensi (makanan/aktivitas) bersama untuk seluruh pengguna.
+
+    Entri dianggap segar selama `ttl` detik. Setelah itu katalog divalidasi ulang
+    ke backend memakai ETag/Last-Modified sehingga respons 304 tidak perlu
+    mengunduh dan mem-parse ulang seluruh katalog. Hanya satu request per
+    katalog yang berjalan saat cache kosong/kadaluarsa; request lain menunggu
+    hasil yang sama.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: dict[str, dict] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def _fresh(self, entry: dict | None) -> bool:
+        return entry is not None and time.monotonic() - entry["fetched_at"] < self.ttl
+
+    async def get(self, path: str, headers: dict) -> dict:
+        entry = self._entries.get(path)
+        if self._fresh(entry):
+            return entry["data"]
+
+        lock = self._locks.setdefault(path, asyncio.Lock())
+        async with lock:
+            # Request lain mungkin sudah memuat ulang katalog selama kita menunggu
+            entry = self._entries.get(path)
+            if self._fresh(entry):
+                return entry["data"]
+            return await self._load(path, headers, entry)
+
+    async def _load(self, path: str, headers: dict, entry: dict | None) -> dict:
+        request_headers = dict(headers)
+        if entry is not None:
+            if entry["etag"]:
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        res = await _request(path, request_headers)
+        if res.status_code == 304 and entry is not None:
+            entry["fetched_at"] = time.monotonic()
+            return entry["data"]
+
+        data = res.json()
+        self._entries[path] = {
+            "data": data,
+            "version": res.headers.get("etag") or hashlib.sha256(res.content).hexdigest(),
+            "etag": res.headers.get("etag"),
+            "last_modified": res.headers.get("last-modified"),
+            "fetched_at": time.monotonic(),
         }
-    except Exception as e:
-        raise HTTPException(
-            status_code=502, detail=f"Gagal mengambil data user dari backend: {str(e)}"
-        )
+        return data
+
+    def version(self, path: str) -> str | None:
+        """Versi (ETag atau hash isi) katalog yang sedang di-cache."""
+        entry = self._entries.get(path)
+        return entry["version"] if entry else None
+
+    def invalidate(self, path: str | None = None) -> None:
+        """Hapus satu katalog (atau semuanya) sehingga request berikutnya mengunduh ulang."""
+        if path is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(path, None)
+
+
+catalog_cache = CatalogCache(ttl=CATALOG_TTL)
 
 
-def fetch_user_actv_rec_context(token: str) -> dict:
+def invalidate_catalogs(path: str | None = None) -> None:
+    catalog_cache.invalidate(path)
+
+
+async def _fetch_context(token: str, endpoints: dict) -> dict:
+    """
+    Resolve user_id lewat /api/auth/me, lalu ambil seluruh endpoint
+    yang bergantung pada user_id secara bersamaan.
+    """
     headers = {"Authorization": f"Bearer {token}"} if token else {}
     today = datetime.today().strftime("%Y-%m-%d")
 
     try:
-        user_data = requests.get(f"{BACKEND_URL}/api/auth/me", headers=headers).json()
+        user_data = await timed(
+            "backend.auth_me", identity_cache.resolve(token, headers, _get)
+        )
         user_id = user_data["data"]["user"]["id"]
 
-        def get(endpoint):
-            res = requests.get(endpoint, headers=headers)
-            res.raise_for_status()
-            return res.json()
-
-        return {
-            "user_id": user_id,
-            "user_data": user_data,
-            "user_profile": get(f"{BACKEND_URL}/api/users/{user_id}/profile"),
-            "user_food_track": get(
-                f"{BACKEND_URL}/api/users/{user_id}/nutrition/meals?date={today}"
-            ),
-            "user_activity_today": get(
-                f"{BACKEND_URL}/api/users/{user_id}/activities/today"
-            ),
-            "user_activity_history": get(
-                f"{BACKEND_URL}/api/users/{user_id}/activities/history?startDate=1945-08-17&endDate=2045-08-17"
-            ),
-            "database-activity": get(f"{BACKEND_URL}/api/activities"),
-        }
+        def fetch(key: str):
+            endpoint = endpoints[key]
+            if callable(endpoint):
+                return timed(f"backend.{key}", endpoint(user_id, headers))
+            path = endpoint.format(user_id=user_id, today=today)
+            if path in CATALOG_PATHS:
+                return timed(f"backend.{key}", catalog_cache.get(path, headers))
+            return timed(f"backend.{key}", _get(path, headers))
+
+        keys = list(endpoints)
+        results = await asyncio.gather(*(fetch(key) for key in keys))
+
+        return {"user_id": user_id, "user_data": user_data, **dict(zip(keys, results))}
+    except ResilienceError as e:
+        # Backend sedang gagal/kelebihan beban: tolak cepat tanpa menunggu timeout
+        raise HTTPException(
+            status_code=503,
+            detail=f"Backend sedang tidak tersedia: {str(e)}",
+            headers={"Retry-After": str(int(e.retry_after) + 1)},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=502, detail=f"Gagal mengambil data user dari backend: {str(e)}"
         )
+
+
+async def fetch_user_data(token: str) -> dict:
+    return await _fetch_context(token, USER_DATA_ENDPOINTS)
+
+
+async def fetch_user_data_keys(token: str, keys: list[str]) -> dict:
+    """Seperti fetch_user_data, tetapi hanya untuk key USER_DATA_ENDPOINTS yang diminta."""
+    return await _fetch_context(token, {key: USER_DATA_ENDPOINTS[key] for key in keys})
+
+
+async def fetch_user_food_rec_context(token: str) -> dict:
+    return await _fetch_context(token, FOOD_REC_ENDPOINTS)
+
+
+async def fetch_user_actv_rec_context(token: str) -> dict:
+    return await _fetch_context(token, ACTV_REC_ENDPOINTS)
@@ -1,4 +1,5 @@
 # src/utils/auth.py
+import hashlib
 from fastapi import Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
@@ -11,3 +12,8 @@ def get_bearer_token(
     if credentials:
         return credentials.credentials
     return None
+
+
+def token_fingerprint(token: str | None) -> str:
+    """Hash token untuk dipakai sebagai key tanpa menyimpan token aslinya."""
+    return hashlib.sha256((token or "").encode()).hexdigest()
@@ -0,0 +1,92 @@
+# src/utils/json_repair.py
+import json
+
+CLOSERS = {"{": "}", "[": "]"}
+
+# Batas titik potong (koma) yang dicoba ketika memperbaiki JSON yang terpotong
+MAX_CUT_ATTEMPTS = 50
+
+
+def strip_code_fence(text: str) -> str:
+    """Hapus pembungkus markdown ```json ... ``` jika ada."""
+    cleaned = text.strip()
+    if cleaned.startswith("```json"):
+        cleaned = cleaned[7:]
+    if cleaned.startswith("```"):
+        cleaned = cleaned[3:]
+    if cleaned.endswith("```"):
+        cleaned = cleaned[:-3]
+    return cleaned.strip()
+
+
+def _is_valid(candidate: str) -> bool:
+    try:
+        json.loads(candidate)
+        return True
+    except json.JSONDecodeError:
+        return False
+
+
+def repair_json(text: str) -> str:
+    """
+    Perbaiki JSON keluaran model secara lokal.
+
+    Teks sebelum objek/array pertama dan setelah penutupnya dibuang. Jika
+    JSON terpotong, string yang terbuka diakhiri dan kurung yang masih
+    terbuka ditutup; bila hasilnya belum valid, JSON dipotong mundur ke
+    koma terakhir (elemen terakhir yang lengkap) lalu ditutup kembali.
+    """
+    cleaned = strip_code_fence(text)
+    starts = [index for index in (cleaned.find("{"), cleaned.find("[")) if index != -1]
+    if not starts:
+        return cleaned
+    cleaned = cleaned[min(starts):]
+
+    stack = []
+    cut_points = []
+    in_string = False
+    escaped = False
+    for index, char in enumerate(cleaned):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char == '"':
+            in_string = True
+        elif char in CLOSERS:
+            stack.append(CLOSERS[char])
+        elif char == ",":
+            cut_points.append((index, "".join(reversed(stack))))
+        elif char in "}]":
+            if stack:
+                stack.pop()
+            if not stack:
+                # Objek utama sudah lengkap; sisa teks diabaikan
+                return cleaned[: index + 1]
+
+    # Terpotong sebelum objek utama selesai
+    tail = cleaned[:-1] if escaped else cleaned
+    if in_string:
+        tail += '"'
+    candidates = [tail.rstrip().rstrip(",") + "".join(reversed(stack))]
+    for index, closers in reversed(cut_points[-MAX_CUT_ATTEMPTS:]):
+        candidates.append(cleaned[:index] + closers)
+
+    for candidate in candidates:
+        if _is_valid(candidate):
+            return candidate
+    return candidates[0]
+
+
+def parse_model_json(text: str):
+    """Parse JSON keluaran model, mencoba perbaikan lokal jika parse langsung gagal."""
+    cleaned = strip_code_fence(text)
+    try:
+        return json.loads(cleaned)
+    except json.JSONDecodeError:
+        return json.loads(repair_json(cleaned))
@@ -0,0 +1,186 @@
+# src/utils/metrics.py
+import bisect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Bucket default (detik) untuk durasi tahap, dari request backend hingga generate Gemini
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+BYTE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+# Durasi tiap tahap dalam request yang sedang berjalan, untuk header Server-Timing
+_request_timings: ContextVar[dict | None] = ContextVar("request_timings", default=None)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(dict(key))} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        # label -> (jumlah per bucket, total nilai, jumlah observasi)
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[0][index] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, count) in self._series.items():
+            labels = dict(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                bucket_labels = _format_labels({**labels, "le": f"{bound:g}"})
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': '+Inf'})} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class CallbackMetric:
+    """
+    Metrik yang nilainya dibaca dari fungsi `collect` saat /metrics diminta,
+    misal statistik cache atau antrean. `collect` mengembalikan angka atau
+    dict {nilai label: angka}.
+    """
+
+    def __init__(self, name: str, help: str, collect, type: str = "gauge", label: str = "name"):
+        self.name = name
+        self.help = help
+        self.collect = collect
+        self.type = type
+        self.label = label
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        values = self.collect()
+        if isinstance(values, dict):
+            for key, value in values.items():
+                lines.append(f"{self.name}{_format_labels({self.label: key})} {value}")
+        else:
+            lines.append(f"{self.name} {values}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+stage_duration = registry.register(
+    Histogram("ai_stage_duration_seconds", "Durasi tiap tahap pemrosesan request")
+)
+request_duration = registry.register(
+    Histogram("ai_http_request_duration_seconds", "Durasi request HTTP per endpoint")
+)
+gemini_tokens = registry.register(
+    Histogram("ai_gemini_tokens", "Jumlah token prompt/respons per panggilan Gemini", TOKEN_BUCKETS)
+)
+prompt_context_bytes = registry.register(
+    Histogram(
+        "ai_prompt_context_bytes",
+        "Ukuran konteks pengguna di prompt sesudah proyeksi (sebelumnya hanya saat log debug)",
+        BYTE_BUCKETS,
+    )
+)
+stage_errors = registry.register(
+    Counter("ai_stage_errors_total", "Jumlah tahap yang gagal")
+)
+
+
+@contextmanager
+def span(stage: str):
+    """Catat durasi satu tahap ke histogram dan ke Server-Timing request saat ini."""
+    started = time.perf_counter()
+    try:
+        yield
+    except GeneratorExit:
+        # Generator ditutup lebih awal (misal klien SSE terputus), bukan kegagalan tahap
+        raise
+    except BaseException:
+        stage_errors.inc(stage=stage)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        stage_duration.observe(elapsed, stage=stage)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + elapsed
+
+
+async def timed(stage: str, awaitable):
+    with span(stage):
+        return await awaitable
+
+
+def record_token_usage(kind: str, usage_metadata) -> None:
+    if usage_metadata is None:
+        return
+    prompt_tokens = getattr(usage_metadata, "prompt_token_count", None)
+    response_tokens = getattr(usage_metadata, "candidates_token_count", None)
+    if prompt_tokens:
+        gemini_tokens.observe(prompt_tokens, kind=kind, type="prompt")
+    if response_tokens:
+        gemini_tokens.observe(response_tokens, kind=kind, type="response")
+
+
+def start_request_timings() -> dict:
+    timings = {}
+    _request_timings.set(timings)
+    return timings
+
+
+def server_timing_header(timings: dict) -> str:
+    return ", ".join(
+        f"{stage};dur={elapsed * 1000:.1f}" for stage, elapsed in timings.items()
+    )
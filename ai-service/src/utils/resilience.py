@@ -0,0 +1,182 @@
+# src/utils/resilience.py
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable
+
+
+class ResilienceError(Exception):
+    """Panggilan ditolak tanpa dijalankan; `retry_after` adalah saran jeda (detik)."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(ResilienceError):
+    pass
+
+
+class OverloadedError(ResilienceError):
+    pass
+
+
+class TokenBucket:
+    """
+    Pembatas laju: `rate` token per detik dengan kapasitas burst `capacity`.
+
+    Pemanggil menunggu token tersedia, tetapi ditolak dengan OverloadedError
+    jika waktu tunggu melebihi `max_wait` sehingga antrean tidak menumpuk.
+    `rate` <= 0 menonaktifkan pembatasan.
+    """
+
+    def __init__(self, rate: float, capacity: float, max_wait: float):
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self.max_wait = max_wait
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    async def _reserve(self) -> float:
+        """
+        Isi ulang bucket lalu ambil satu token di muka (boleh negatif) agar
+        pemanggil berikutnya antre di belakangnya. Mengembalikan lama tunggu;
+        token tidak diambil jika tunggu melebihi `max_wait`.
+        """
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        wait = (1 - self._tokens) / self.rate
+        if wait <= self.max_wait:
+            self._tokens -= 1
+        return wait
+
+    async def acquire(self, name: str) -> None:
+        if self.rate <= 0:
+            return
+        wait = await self._reserve()
+        if wait > self.max_wait:
+            raise OverloadedError(f"{name}: batas laju terlampaui", retry_after=wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker sederhana: terbuka setelah `failure_threshold` kegagalan
+    beruntun dan menolak panggilan selama `reset_timeout` detik. Setelah itu
+    satu panggilan percobaan diizinkan; jika berhasil breaker kembali tertutup.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def check(self, name: str) -> None:
+        state = self.state
+        if state == "closed":
+            return
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return
+        retry_after = max(self.reset_timeout - (time.monotonic() - self._opened_at), 1)
+        raise CircuitOpenError(f"{name}: circuit breaker terbuka", retry_after=retry_after)
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def release_probe(self) -> None:
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+        self._probing = False
+
+
+class Resilient:
+    """
+    Membungkus panggilan ke layanan eksternal dengan batas waktu per percobaan,
+    retry eksponensial dengan jitter untuk error yang `retryable`, pembatas laju
+    (opsional), dan circuit breaker. Hanya error yang `retryable` (timeout,
+    rate limit, 5xx) yang dihitung sebagai kegagalan breaker; error klien
+    seperti 401/404 langsung diteruskan.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        timeout: float,
+        retries: int,
+        retryable: Callable[[BaseException], bool],
+        breaker: CircuitBreaker,
+        limiter: TokenBucket | None = None,
+        base_delay: float = 0.2,
+        max_delay: float = 5.0,
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.retries = retries
+        self.retryable = retryable
+        self.breaker = breaker
+        self.limiter = limiter
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.calls = 0
+        self.retried = 0
+        self.rejected = 0
+
+    def _is_retryable(self, error: BaseException) -> bool:
+        return isinstance(error, asyncio.TimeoutError) or self.retryable(error)
+
+    async def call(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        for attempt in range(self.retries + 1):
+            try:
+                if self.limiter is not None:
+                    await self.limiter.acquire(self.name)
+                # Probe half-open baru diklaim setelah limiter, tepat sebelum fn()
+                # dijalankan, agar penolakan/pembatalan di limiter tidak menahannya
+                self.breaker.check(self.name)
+            except ResilienceError:
+                self.rejected += 1
+                raise
+
+            try:
+                result = await asyncio.wait_for(fn(), self.timeout)
+            except asyncio.CancelledError:
+                self.breaker.release_probe()
+                raise
+            except Exception as e:
+                if not self._is_retryable(e):
+                    # Layanan merespons dengan benar (misal 4xx); bukan kegagalan breaker
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                if attempt == self.retries:
+                    raise
+                self.retried += 1
+                delay = min(self.max_delay, self.base_delay * 2**attempt)
+                await asyncio.sleep(random.uniform(0, delay))
+                continue
+
+            self.breaker.record_success()
+            return result
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "retried": self.retried, "rejected": self.rejected}
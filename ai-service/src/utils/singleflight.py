@@ -0,0 +1,69 @@
+# src/utils/singleflight.py
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+# Batas entri hasil terbaru sebelum entri kadaluarsa dibersihkan
+MAX_RECENT = 1024
+
+
+class SingleFlight:
+    """
+    Menggabungkan panggilan bersamaan dengan key yang sama menjadi satu eksekusi.
+
+    Eksekusi berjalan sebagai task tersendiri yang ditunggu semua pemanggil,
+    sehingga tetap selesai meskipun pemanggil pertama dibatalkan.
+    Hasil yang berhasil juga dibagikan kepada pemanggil yang datang dalam
+    `window` detik setelah eksekusi selesai (misal refresh beruntun dari app).
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self.executed = 0
+        self.coalesced = 0
+        self._calls: dict[str, asyncio.Task] = {}
+        self._recent: dict[str, tuple[float, Any]] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        recent = self._recent.get(key)
+        if recent is not None and time.monotonic() - recent[0] < self.window:
+            self.coalesced += 1
+            return recent[1]
+
+        task = self._calls.get(key)
+        if task is None:
+            # Dijalankan sebagai task terpisah agar pemanggil yang dibatalkan (misal
+            # klien terputus) tidak ikut membatalkan eksekusi yang ditunggu pemanggil lain
+            task = asyncio.ensure_future(self._run(key, fn))
+            # Tandai exception sudah diambil agar tidak ada peringatan jika semua pemanggil pergi
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._calls[key] = task
+            self.executed += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    async def _run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            result = await fn()
+            self._remember(key, result)
+            return result
+        finally:
+            self._calls.pop(key, None)
+
+    def _remember(self, key: str, result: Any) -> None:
+        if self.window <= 0:
+            return
+        now = time.monotonic()
+        if len(self._recent) >= MAX_RECENT:
+            self._recent = {
+                k: v for k, v in self._recent.items() if now - v[0] < self.window
+            }
+        self._recent[key] = (now, result)
+
+    def stats(self) -> dict:
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }
@@ -0,0 +1,8 @@
+# src/utils/sse.py
+import json
+
+
+def format_sse(data: dict, event: str | None = None) -> str:
+    """Membentuk satu frame Server-Sent Events dari payload JSON."""
+    frame = f"event: {event}\n" if event else ""
+    return frame + f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
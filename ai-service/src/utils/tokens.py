@@ -0,0 +1,6 @@
+# src/utils/tokens.py
+
+
+def estimate_tokens(text: str) -> int:
+    """Perkiraan kasar jumlah token (~4 karakter per token)."""
+    return len(text) // 4 + 1
@@ -0,0 +1,6 @@
+# tests/conftest.py
+import sys
+from pathlib import Path
+
+# Modul service diimpor seperti saat dijalankan dari src/ (misal `from utils.resilience import ...`)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
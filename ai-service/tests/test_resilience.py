@@ -0,0 +1,247 @@
+# tests/test_resilience.py
+import asyncio
+import pytest
+from utils import resilience
+from utils.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    OverloadedError,
+    Resilient,
+    TokenBucket,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(resilience.time, "monotonic", fake)
+    return fake
+
+
+def open_breaker(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.failure_threshold):
+        breaker.check("test")
+        breaker.record_failure()
+
+
+def make_resilient(breaker: CircuitBreaker, limiter: TokenBucket | None = None) -> Resilient:
+    return Resilient(
+        "test",
+        timeout=1,
+        retries=0,
+        retryable=lambda error: isinstance(error, RuntimeError),
+        breaker=breaker,
+        limiter=limiter,
+    )
+
+
+async def succeed():
+    return "ok"
+
+
+async def fail():
+    raise RuntimeError("gagal")
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.check("test")
+    assert excinfo.value.retry_after == 10
+
+
+def test_breaker_success_resets_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_breaker_half_open_allows_single_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    open_breaker(breaker)
+    clock.now += 10
+    assert breaker.state == "half_open"
+
+    breaker.check("test")
+    with pytest.raises(CircuitOpenError):
+        breaker.check("test")
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.check("test")
+
+
+def test_breaker_failed_probe_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+    open_breaker(breaker)
+    clock.now += 10
+    breaker.check("test")
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now += 10
+    breaker.check("test")
+
+
+def test_breaker_released_probe_can_be_claimed_again(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    open_breaker(breaker)
+    clock.now += 10
+    breaker.check("test")
+    breaker.release_probe()
+    assert breaker.state == "half_open"
+    breaker.check("test")
+
+
+def test_token_bucket_allows_burst_then_rejects(clock):
+    bucket = TokenBucket(rate=1, capacity=2, max_wait=0)
+
+    async def scenario():
+        await bucket.acquire("test")
+        await bucket.acquire("test")
+        with pytest.raises(OverloadedError) as excinfo:
+            await bucket.acquire("test")
+        return excinfo.value
+
+    error = asyncio.run(scenario())
+    assert error.retry_after == pytest.approx(1)
+
+
+def test_token_bucket_refills_over_time(clock):
+    bucket = TokenBucket(rate=2, capacity=1, max_wait=0)
+
+    async def scenario():
+        await bucket.acquire("test")
+        clock.now += 0.5
+        await bucket.acquire("test")
+
+    asyncio.run(scenario())
+
+
+def test_token_bucket_rejected_call_does_not_take_token(clock):
+    bucket = TokenBucket(rate=1, capacity=1, max_wait=0.5)
+
+    async def scenario():
+        await bucket.acquire("test")
+        with pytest.raises(OverloadedError):
+            await bucket.acquire("test")
+        clock.now += 1
+        await bucket.acquire("test")
+
+    asyncio.run(scenario())
+
+
+def test_token_bucket_disabled_when_rate_not_positive(clock):
+    bucket = TokenBucket(rate=0, capacity=1, max_wait=0)
+
+    async def scenario():
+        for _ in range(10):
+            await bucket.acquire("test")
+
+    asyncio.run(scenario())
+
+
+def test_resilient_limiter_rejection_keeps_probe_available(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    limiter = TokenBucket(rate=1, capacity=1, max_wait=0)
+    wrapped = make_resilient(breaker, limiter)
+    open_breaker(breaker)
+    clock.now += 10
+
+    async def scenario():
+        await limiter.acquire("test")
+        with pytest.raises(OverloadedError):
+            await wrapped.call(succeed)
+        assert breaker.state == "half_open"
+        clock.now += 1
+        return await wrapped.call(succeed)
+
+    assert asyncio.run(scenario()) == "ok"
+    assert breaker.state == "closed"
+    assert wrapped.rejected == 1
+
+
+def test_resilient_cancelled_limiter_wait_keeps_probe_available(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    limiter = TokenBucket(rate=1, capacity=1, max_wait=60)
+    wrapped = make_resilient(breaker, limiter)
+    open_breaker(breaker)
+    clock.now += 10
+
+    async def scenario():
+        await limiter.acquire("test")
+        task = asyncio.create_task(wrapped.call(succeed))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        breaker.check("test")
+
+    asyncio.run(scenario())
+
+
+def test_resilient_cancelled_call_releases_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    wrapped = make_resilient(breaker)
+    open_breaker(breaker)
+    clock.now += 10
+
+    async def scenario():
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.Event().wait()
+
+        task = asyncio.create_task(wrapped.call(hang))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        breaker.check("test")
+
+    asyncio.run(scenario())
+
+
+def test_resilient_retryable_failures_open_breaker(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    wrapped = make_resilient(breaker)
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await wrapped.call(fail)
+        with pytest.raises(CircuitOpenError):
+            await wrapped.call(succeed)
+
+    asyncio.run(scenario())
+    assert wrapped.rejected == 1
+
+
+def test_resilient_non_retryable_error_is_not_breaker_failure(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    wrapped = make_resilient(breaker)
+
+    async def client_error():
+        raise ValueError("404")
+
+    async def scenario():
+        with pytest.raises(ValueError):
+            await wrapped.call(client_error)
+
+    asyncio.run(scenario())
+    assert breaker.state == "closed"